@@ -1,6 +1,6 @@
 import streamlit as st
 import numpy as np
-from utils import inject_css, init_state, load_listings, render_risk_timeline_sidebar
+from app.utils import inject_css, init_state, load_listings, render_risk_timeline_sidebar, profile_page_done
 
 # ✅ MUST be at top-level (before any UI calls)
 st.set_page_config(
@@ -341,7 +341,7 @@ def main():
 
     if st.sidebar.button("Log out"):
         st.session_state.auth = False
-        st.session_state.risk_timeline = []
+        st.session_state.risk_timeline.clear()
         st.session_state.chat = []
         st.session_state.email_verified = False
         st.session_state.otp_sent = False
@@ -358,4 +358,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    profile_page_done()
@@ -0,0 +1,27 @@
+"""
+Build the compiled listings catalog from the CSV.
+
+Run from the project folder (next to data/):
+    python -m app.build_catalog                  # data/listings.csv -> data/listings.arrow
+    python -m app.build_catalog path/to/listings.csv --out path/to/listings.arrow
+
+load_listings() picks the compiled file up automatically while it is newer than the CSV and
+the geocoder files (data/gazetteer.csv, data/area_aliases.csv).
+"""
+import argparse
+
+from app.utils import LISTINGS_CSV, compile_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile listings.csv into a typed Arrow catalog.")
+    parser.add_argument("csv_path", nargs="?", default=LISTINGS_CSV)
+    parser.add_argument("--out", default=None, help="output path (default: next to the CSV, .arrow)")
+    args = parser.parse_args()
+
+    path = compile_catalog(args.csv_path, args.out)
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
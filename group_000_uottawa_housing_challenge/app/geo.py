@@ -0,0 +1,261 @@
+"""
+Areas, commute times and coordinates for listings -- all from local data files, no external
+services: area aliases (resolve_area), the precomputed commute table, the gazetteer geocoder
+and the grid spatial index behind the Browse "near" filter.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ---------- CONFIG ----------
+COMMUTE_CSV = "data/commute_times.csv"  # area -> minutes to campus, precomputed offline
+AREA_ALIASES_CSV = "data/area_aliases.csv"  # other names for catalog areas (residences, "The Glebe", ...)
+GAZETTEER_CSV = "data/gazetteer.csv"    # campus, residences, areas and streets -> lat/lon
+GEO_CELL_KM = 0.5                        # grid cell size of the spatial index
+
+
+# ---------- AREAS ----------
+# Onboarding offers these (residences + neighbourhoods); the catalog names areas its own way
+# ("Glebe", "ByWard Market"). Every area name -- profile, catalog, commute table, gazetteer --
+# goes through resolve_area(), which applies AREA_ALIASES_CSV (alias, area; one alias may
+# stand for several areas).
+AREA_GROUPS = {
+    "uOttawa / Residences": [
+        "Annex", "45 Mann", "Friel", "Leblanc", "Thompson", "Rideau",
+        "Hyman Soloway", "90 University", "Stanton", "Marchand", "Henderson",
+    ],
+    "Nearby / Central Ottawa": [
+        "Sandy Hill", "ByWard Market / Lowertown", "Centretown", "Golden Triangle",
+        "Old Ottawa East", "The Glebe", "Vanier", "Overbrook",
+    ],
+    "West / Other": [
+        "Hintonburg", "Little Italy", "Westboro", "Alta Vista",
+        "Nepean", "Kanata", "Barrhaven",
+    ],
+}
+
+
+def area_key(name) -> str:
+    """How area names are compared: case and spacing ignored."""
+    return " ".join(str(name or "").lower().split())
+
+
+@st.cache_data
+def _load_area_aliases(csv_path: str, mtime: float) -> dict:
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    aliases = {}
+    for alias, area in zip(df["alias"], df["area"]):
+        aliases.setdefault(area_key(alias), []).append(area_key(area))
+    return {k: tuple(v) for k, v in aliases.items()}
+
+
+def area_aliases(csv_path: str = AREA_ALIASES_CSV) -> dict:
+    """{alias key: (area keys it stands for)} ({} without the file). Re-read when the file changes."""
+    if not os.path.exists(csv_path):
+        return {}
+    return _load_area_aliases(csv_path, os.path.getmtime(csv_path))
+
+
+def resolve_area(name) -> tuple:
+    """The area keys a name stands for: "The Glebe" -> ("glebe",), "ByWard Market / Lowertown" -> both."""
+    key = area_key(name)
+    return area_aliases().get(key, (key,))
+
+
+def _area_lookup(table: dict, name, default):
+    """table[name], else the first of its resolved areas in table, else default."""
+    key = area_key(name)
+    if key in table:
+        return table[key]
+    return next((table[k] for k in resolve_area(name) if k in table), default)
+
+
+def unmatched_areas(names, catalog_areas) -> list:
+    """The names (e.g. AREA_GROUPS entries) that resolve to none of `catalog_areas`."""
+    known = {k for a in catalog_areas for k in resolve_area(a)}
+    return [n for n in names if not known.intersection(resolve_area(n))]
+
+
+# ---------- COMMUTE TIMES ----------
+# Travel times to campus come from COMMUTE_CSV (area, minutes), built offline -- no routing
+# service at runtime. Listings join it on area (through resolve_area).
+@st.cache_data
+def _load_commute_table(csv_path: str, mtime: float) -> dict:
+    df = pd.read_csv(csv_path, dtype={"area": str}, keep_default_na=False)
+    return {area_key(a): float(m) for a, m in zip(df["area"], df["minutes"])}
+
+
+def commute_table(csv_path: str = COMMUTE_CSV) -> dict:
+    """{area_key: minutes to campus} ({} without the file). Re-read when the file changes."""
+    if not os.path.exists(csv_path):
+        return {}
+    return _load_commute_table(csv_path, os.path.getmtime(csv_path))
+
+
+def commute_minutes(areas) -> np.ndarray:
+    """Minutes to campus for each area (NaN = not in the table), one lookup per distinct area."""
+    codes, uniques = pd.factorize(pd.Series(areas, dtype=object))
+    table = commute_table()
+    lookup = np.array([_area_lookup(table, a, np.nan) for a in uniques] + [np.nan])
+    return lookup[codes]  # code -1 (missing area) picks the trailing NaN
+
+
+def commute_label(minutes) -> str:
+    return "Commute unknown" if pd.isna(minutes) else f"{int(minutes)} min to campus"
+
+
+# ---------- GEOCODING + SPATIAL INDEX ----------
+# Coordinates come from a local gazetteer (GAZETTEER_CSV: name, kind, "|"-separated aliases,
+# lat, lon) -- no geocoding service. An address resolves to its street, else to its area
+# (area names through resolve_area, like the commute table).
+# Distances use a flat-earth projection around the data's latitude, fine at city scale.
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON_EQUATOR = 111.320
+
+
+@st.cache_data
+def _load_gazetteer(csv_path: str, mtime: float) -> dict:
+    df = pd.read_csv(csv_path, dtype={"aliases": str}, keep_default_na=False)
+    streets, places = {}, {}
+    for name, kind, aliases, lat, lon in zip(df["name"], df["kind"], df["aliases"], df["lat"], df["lon"]):
+        table = streets if kind == "street" else places
+        for n in [name, *aliases.split("|")]:
+            if n.strip():
+                table[area_key(n)] = (float(lat), float(lon))
+    return {"places": df[["name", "kind", "lat", "lon"]], "streets": streets, "areas": places}
+
+
+def gazetteer(csv_path: str = GAZETTEER_CSV) -> dict:
+    """
+    {"places": the gazetteer rows, "streets": {key: (lat, lon)}, "areas": {key: (lat, lon)}
+    for everything that is not a street}; keys as area_key(). Empty without the file.
+    """
+    if not os.path.exists(csv_path):
+        return {"places": pd.DataFrame(columns=["name", "kind", "lat", "lon"]), "streets": {}, "areas": {}}
+    return _load_gazetteer(csv_path, os.path.getmtime(csv_path))
+
+
+def landmarks() -> dict:
+    """{name: (lat, lon)} of the campus and residences, campus first -- the "near" choices."""
+    places = gazetteer()["places"]
+    places = places[places["kind"].isin(["campus", "residence"])].sort_values("kind", kind="stable")
+    return {n: (float(a), float(b)) for n, a, b in zip(places["name"], places["lat"], places["lon"])}
+
+
+def _gazetteer_lookup(names, table: dict):
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object))
+    found = [_area_lookup(table, n, (np.nan, np.nan)) for n in uniques] + [(np.nan, np.nan)]
+    coords = np.array(found, dtype=float)[codes]  # code -1 (missing) picks the trailing NaNs
+    return coords[:, 0], coords[:, 1]
+
+
+def geocode(addresses, areas):
+    """(lat, lon) arrays: each address's street from the gazetteer, else its area (NaN if neither is known)."""
+    streets = pd.Series(addresses, dtype=object).str.replace(r"^\s*\d+\w*\s+", "", regex=True)
+    g = gazetteer()
+    lat, lon = _gazetteer_lookup(streets, g["streets"])
+    area_lat, area_lon = _gazetteer_lookup(areas, g["areas"])
+    missing = np.isnan(lat)
+    lat[missing], lon[missing] = area_lat[missing], area_lon[missing]
+    return lat, lon
+
+
+def geocoder_files() -> tuple:
+    """The files geocode() reads; coordinates stored elsewhere are stale once one of them changes."""
+    return GAZETTEER_CSV, AREA_ALIASES_CSV
+
+
+def geocoder_stamp() -> str:
+    """The geocoder files' mtimes as one string ("-" = no such file), stored next to saved coordinates."""
+    return ";".join(f"{os.path.getmtime(p) if os.path.exists(p) else '-'}" for p in geocoder_files())
+
+
+def listing_coordinates(df: pd.DataFrame):
+    """df's lat/lon columns, geocoded on the fly for frames that do not carry them."""
+    if "lat" in df.columns and "lon" in df.columns:
+        return (pd.to_numeric(df["lat"], errors="coerce").to_numpy(dtype=float),
+                pd.to_numeric(df["lon"], errors="coerce").to_numpy(dtype=float))
+    return geocode(df["address"] if "address" in df.columns else [None] * len(df), df["area"])
+
+
+def distance_km(lat, lon, lat2, lon2, lat0: float = None):
+    """Distance (km) between points, flat-earth around lat0 (default: the first point's latitude)."""
+    lat0 = np.nanmean(lat) if lat0 is None else lat0
+    kx = KM_PER_DEG_LON_EQUATOR * np.cos(np.radians(lat0))
+    return np.hypot((np.asarray(lon) - lon2) * kx, (np.asarray(lat) - lat2) * KM_PER_DEG_LAT)
+
+
+def build_spatial_index(lat, lon, cell_km: float = GEO_CELL_KM) -> dict:
+    """
+    Grid spatial index over points (positions = array positions; NaN points are left out):
+      x, y  -- projected km coordinates of every point
+      cells -- {(cx, cy): positions in that cell_km x cell_km cell}
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    ok = ~(np.isnan(lat) | np.isnan(lon))
+    lat0 = float(lat[ok].mean()) if ok.any() else 45.0
+    x = lon * KM_PER_DEG_LON_EQUATOR * np.cos(np.radians(lat0))
+    y = lat * KM_PER_DEG_LAT
+
+    pos = np.flatnonzero(ok)
+    cx = np.floor(x[pos] / cell_km).astype(np.int64)
+    cy = np.floor(y[pos] / cell_km).astype(np.int64)
+    order = np.lexsort((cy, cx))  # points of one cell end up contiguous
+    pos, cx, cy = pos[order], cx[order], cy[order]
+    starts = np.flatnonzero(np.r_[True, (cx[1:] != cx[:-1]) | (cy[1:] != cy[:-1])]) if len(pos) else np.empty(0, dtype=int)
+    ends = np.r_[starts[1:], len(pos)].astype(int)
+    cells = {(int(cx[a]), int(cy[a])): pos[a:b] for a, b in zip(starts, ends)}
+    return {"lat0": lat0, "cell_km": cell_km, "x": x, "y": y, "cells": cells, "size": len(pos)}
+
+
+def _spatial_query_point(index: dict, lat: float, lon: float):
+    qx = lon * KM_PER_DEG_LON_EQUATOR * np.cos(np.radians(index["lat0"]))
+    qy = lat * KM_PER_DEG_LAT
+    return qx, qy, int(np.floor(qx / index["cell_km"])), int(np.floor(qy / index["cell_km"]))
+
+
+def _cells_positions(index: dict, keys) -> np.ndarray:
+    found = [index["cells"][k] for k in keys if k in index["cells"]]
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+
+def spatial_within(index: dict, lat: float, lon: float, km: float) -> np.ndarray:
+    """Positions of the points within `km` of (lat, lon), ascending -- only nearby cells are read."""
+    qx, qy, cx, cy = _spatial_query_point(index, lat, lon)
+    r = int(np.ceil(km / index["cell_km"]))
+    cand = _cells_positions(index, ((i, j) for i in range(cx - r, cx + r + 1) for j in range(cy - r, cy + r + 1)))
+    near = np.hypot(index["x"][cand] - qx, index["y"][cand] - qy) <= km
+    return np.sort(cand[near])
+
+
+def spatial_nearest(index: dict, lat: float, lon: float, k: int) -> np.ndarray:
+    """
+    Positions of the k points nearest to (lat, lon), nearest first. Rings of cells are read
+    outwards until the k-th best distance is closer than any cell not read yet.
+    """
+    qx, qy, cx, cy = _spatial_query_point(index, lat, lon)
+    k = min(int(k), index["size"])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    parts, seen, r = [], 0, 0
+    while True:
+        if r == 0:
+            ring = [(cx, cy)]
+        else:
+            ring = [(i, j) for i in range(cx - r, cx + r + 1) for j in (cy - r, cy + r)]
+            ring += [(i, j) for i in (cx - r, cx + r) for j in range(cy - r + 1, cy + r)]
+        found = _cells_positions(index, ring)
+        parts.append(found)
+        seen += len(found)
+        if seen >= k:
+            cand = np.concatenate(parts)
+            dist = np.hypot(index["x"][cand] - qx, index["y"][cand] - qy)
+            kth = np.partition(dist, k - 1)[k - 1]
+            # anything outside rings 0..r is at least r cells away from the query point
+            if kth <= r * index["cell_km"] or seen == index["size"]:
+                best = np.argpartition(dist, k - 1)[:k]
+                return cand[best[np.argsort(dist[best], kind="stable")]]
+        r += 1
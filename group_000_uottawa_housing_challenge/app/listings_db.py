@@ -0,0 +1,210 @@
+"""
+Optional SQLite backend for the listings store (LISTINGS_DB): connection pool, schema and
+migrations, write transactions and row conversion. app.utils decides when to use it and
+keeps the per-session reads.
+"""
+import contextlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from app.geo import geocode, geocoder_stamp, listing_coordinates
+
+# Optional SQLite file shared by every session (e.g. LISTINGS_DB=data/listings.db); seeded from
+# data/listings.csv on first use. Unset = each session keeps its own in-memory copy of the CSV.
+LISTINGS_DB = os.environ.get("LISTINGS_DB") or None
+
+def landlord_key(name) -> str:
+    """How landlord names are matched: trimmed, case-insensitive."""
+    return str(name or "").strip().lower()
+
+
+# ---------- CONNECTIONS + SCHEMA ----------
+# One shared table instead of a frame per session. WAL mode lets any number of sessions read
+# while one writes; writers take BEGIN IMMEDIATE and bump listings_state.version, which is what
+# listings_version() (and every versioned_cache) keys on.
+LISTINGS_DB_COLUMNS = {
+    "id": "INTEGER PRIMARY KEY",
+    "title": "TEXT",
+    "area": "TEXT",
+    "price": "INTEGER",
+    "beds": "INTEGER",
+    "landlord": "TEXT",
+    "verified_at": "TEXT",  # "YYYY-MM-DD HH:MM:SS", so date cutoffs compare as strings
+    "pending": "INTEGER",
+    "photo_count": "INTEGER",
+    "lease_draft_uploaded": "INTEGER",
+    "address": "TEXT",
+    "available_date": "TEXT",
+    "lease_length": "TEXT",
+    "lat": "REAL",
+    "lon": "REAL",
+    "landlord_key": "TEXT",  # landlord_key(landlord), so one landlord's rows are an indexed lookup
+}
+LISTINGS_DB_INDEXES = ("area", "price", "landlord_key", "pending", "verified_at", "lat")
+# Streamlit runs every rerun on a fresh thread, so connections are handed out per thread and
+# taken back once that thread has finished: the pool never grows past the live threads.
+_DB_LOCK = threading.Lock()
+_DB_OWNERS = {}   # thread -> the connection it is using
+_DB_IDLE = []     # connections whose threads have finished, ready for reuse
+_DB_READY = set()  # database paths whose schema + seed were checked by this process
+
+
+def _connect():
+    # check_same_thread=False: a connection moves to a new thread only after its old one ended
+    con = sqlite3.connect(LISTINGS_DB, timeout=30, isolation_level=None, check_same_thread=False)  # transactions are explicit
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+
+def db_connection(seed):
+    """
+    This thread's connection to LISTINGS_DB, or None when the SQLite backend is off.
+    `seed()` returns the listings frame an empty database is filled with (only called then).
+    """
+    if not LISTINGS_DB:
+        return None
+    thread = threading.current_thread()
+    con = _DB_OWNERS.get(thread)
+    if con is not None:
+        return con
+    with _DB_LOCK:
+        for t in [t for t in _DB_OWNERS if not t.is_alive()]:
+            _DB_IDLE.append(_DB_OWNERS.pop(t))
+        con = _DB_IDLE.pop() if _DB_IDLE else _connect()
+        if LISTINGS_DB not in _DB_READY:  # schema + seed once per process, not on every read
+            _init(con, seed)
+            _DB_READY.add(LISTINGS_DB)
+        _DB_OWNERS[thread] = con
+    return con
+
+
+@contextlib.contextmanager
+def db_write(con, bump: bool = True):
+    """One write transaction; bumps the shared listings version on commit."""
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+        if bump:
+            con.execute("UPDATE listings_state SET version = version + 1")
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+
+
+def _schema_current(con) -> bool:
+    """Read-only check: every column exists, the table was seeded and its coordinates are current."""
+    have = {r[1] for r in con.execute("PRAGMA table_info(listings)")}
+    if not set(LISTINGS_DB_COLUMNS) <= have:
+        return False
+    try:
+        state = con.execute("SELECT geocoder FROM listings_state").fetchone()
+    except sqlite3.OperationalError:  # no listings_state table (or geocoder column) yet
+        return False
+    return state is not None and state[0] == geocoder_stamp()
+
+
+def _init(con, seed):
+    """
+    Create the schema + indexes, and seed from seed() the first time; re-geocode every row
+    when the geocoder files changed since. Only takes the write lock when something is
+    actually missing or stale.
+    """
+    if _schema_current(con):
+        return
+    with db_write(con, bump=False):
+        cols = ", ".join(f"{c} {t}" for c, t in LISTINGS_DB_COLUMNS.items())
+        con.execute(f"CREATE TABLE IF NOT EXISTS listings ({cols})")
+        have = {r[1] for r in con.execute("PRAGMA table_info(listings)")}
+        for c in [c for c in LISTINGS_DB_COLUMNS if c not in have]:  # databases from before a column existed
+            con.execute(f"ALTER TABLE listings ADD COLUMN {c} {LISTINGS_DB_COLUMNS[c]}")
+        if "landlord_key" not in have:
+            _backfill_landlord_keys(con)
+        for c in LISTINGS_DB_INDEXES:
+            con.execute(f"CREATE INDEX IF NOT EXISTS listings_{c} ON listings ({c})")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS listings_state (version INTEGER NOT NULL, next_id INTEGER NOT NULL, geocoder TEXT)"
+        )
+        if "geocoder" not in {r[1] for r in con.execute("PRAGMA table_info(listings_state)")}:
+            con.execute("ALTER TABLE listings_state ADD COLUMN geocoder TEXT")
+        state = con.execute("SELECT geocoder FROM listings_state").fetchone()
+        if state is None:
+            df = seed()
+            db_insert(con, df)
+            con.execute(
+                "INSERT INTO listings_state VALUES (1, ?, ?)",
+                (int(df["id"].max()) + 1 if len(df) else 1, geocoder_stamp()),
+            )
+        elif state[0] != geocoder_stamp():  # rows geocoded with other gazetteer / alias files
+            _backfill_coordinates(con)
+            con.execute("UPDATE listings_state SET geocoder = ?, version = version + 1", (geocoder_stamp(),))
+
+
+def _backfill_coordinates(con):
+    old = pd.read_sql_query("SELECT id, address, area FROM listings", con)
+    lat, lon = geocode(old["address"], old["area"])
+    con.executemany(
+        "UPDATE listings SET lat = ?, lon = ? WHERE id = ?",
+        ([db_value(a), db_value(b), int(i)] for a, b, i in zip(lat, lon, old["id"])),
+    )
+
+
+def _backfill_landlord_keys(con):
+    old = con.execute("SELECT id, landlord FROM listings").fetchall()
+    con.executemany("UPDATE listings SET landlord_key = ? WHERE id = ?", ((landlord_key(n), i) for i, n in old))
+
+
+def db_value(v):
+    """Python/pandas scalar -> something sqlite3 can bind."""
+    if v is None or (not isinstance(v, str) and pd.isna(v)):
+        return None
+    if isinstance(v, pd.Timestamp):
+        return v.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(v, (bool, np.bool_)):
+        return int(v)
+    if isinstance(v, np.generic):
+        return v.item()
+    return v
+
+
+def db_insert(con, df: pd.DataFrame):
+    """Insert df's rows (columns outside LISTINGS_DB_COLUMNS are dropped; missing lat/lon are geocoded)."""
+    if "lat" not in df.columns or "lon" not in df.columns:
+        lat, lon = listing_coordinates(df)
+        df = df.assign(lat=lat, lon=lon)
+    if "landlord" in df.columns:
+        df = df.assign(landlord_key=df["landlord"].map(landlord_key))
+    cols = [c for c in LISTINGS_DB_COLUMNS if c in df.columns]
+    out = df[cols].astype(object)
+    if "verified_at" in out.columns:
+        out["verified_at"] = pd.to_datetime(df["verified_at"], errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+    rows = ([db_value(v) for v in r] for r in out.itertuples(index=False, name=None))
+    con.executemany(f"INSERT INTO listings ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", rows)
+
+
+def db_row(columns, values) -> pd.Series:
+    """One row read back from SQLite -> a Series with db_frame()'s types, without building a frame."""
+    row = {
+        c: np.nan if v is None and LISTINGS_DB_COLUMNS.get(c) in ("INTEGER", "REAL") else v
+        for c, v in zip(columns, values) if c != "landlord_key"
+    }
+    row["verified_at"] = pd.NaT if row["verified_at"] is None else pd.to_datetime(row["verified_at"], errors="coerce")
+    row["pending"] = bool(row["pending"] or 0)
+    row["lease_draft_uploaded"] = bool(row["lease_draft_uploaded"] or 0)
+    row["photo_count"] = int(row["photo_count"] or 0)
+    return pd.Series(row, dtype=object, name=row["id"])
+
+
+def db_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows read back from SQLite -> the same columns and types load_listings() returns."""
+    df = df.drop(columns="landlord_key", errors="ignore")
+    df["verified_at"] = pd.to_datetime(df["verified_at"], errors="coerce")
+    df["pending"] = df["pending"].fillna(0).astype(bool)
+    df["lease_draft_uploaded"] = df["lease_draft_uploaded"].fillna(0).astype(bool)
+    df["photo_count"] = df["photo_count"].fillna(0).astype(int)
+    return df
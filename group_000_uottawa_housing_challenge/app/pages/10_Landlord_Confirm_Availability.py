@@ -1,9 +1,9 @@
 import streamlit as st
 import pandas as pd
-from app.utils import init_state, load_listings
+from app.utils import init_state, get_listings, get_listing, profile_page_done
 
 init_state()
-df = load_listings("data/listings.csv")
+df = get_listings()
 
 st.markdown("## Landlord — Confirm Availability")
 
@@ -13,9 +13,18 @@ if st.session_state.role != "landlord":
 
 st.caption("MVP: reconfirmation restores trust. In demo, we just show the concept.")
 
+if df.empty:
+    st.info("No listings yet.")
+    st.stop()
+
 listing_id = st.selectbox("Select listing (demo)", df["id"].tolist())
-row = df[df["id"] == int(listing_id)].iloc[0]
+row = get_listing(listing_id)
+if row is None:
+    st.warning("That listing is no longer available. Pick another one.")
+    st.stop()
 st.write(f"**{row['title']}** — {row['area']} — ${int(row['price'])}")
 
 if st.button("Confirm availability", type="primary"):
-    st.success("Availability confirmed (demo). In real app: updates verified_at → badge becomes Verified.")
\ No newline at end of file
+    st.success("Availability confirmed (demo). In real app: updates verified_at → badge becomes Verified.")
+
+profile_page_done()
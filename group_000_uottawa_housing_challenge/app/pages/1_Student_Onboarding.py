@@ -1,5 +1,6 @@
 import streamlit as st
-from app.utils import init_state, inject_css, get_listings
+from app.utils import init_state, inject_css, get_listings, profile_page_done
+from app.geo import AREA_GROUPS
 
 # ----------------------------
 # Init
@@ -137,21 +138,6 @@ div[data-baseweb="slider"] div[aria-hidden="true"]{
 # ----------------------------
 # Areas
 # ----------------------------
-AREA_GROUPS = {
-    "uOttawa / Residences": [
-        "Annex", "45 Mann", "Friel", "Leblanc", "Thompson", "Rideau",
-        "Hyman Soloway", "90 University", "Stanton", "Marchand", "Henderson",
-    ],
-    "Nearby / Central Ottawa": [
-        "Sandy Hill", "ByWard Market / Lowertown", "Centretown", "Golden Triangle",
-        "Old Ottawa East", "The Glebe", "Vanier", "Overbrook",
-    ],
-    "West / Other": [
-        "Hintonburg", "Little Italy", "Westboro", "Alta Vista",
-        "Nepean", "Kanata", "Barrhaven",
-    ],
-}
-
 static_areas = [a for group in AREA_GROUPS.values() for a in group]
 df_areas = []
 if "area" in df.columns:
@@ -265,4 +251,6 @@ with right:
     done = sum(st.session_state.squad["checklist"].values())
     total = len(st.session_state.squad["checklist"])
     st.progress(done / max(total, 1))
-    st.caption(f"{done}/{total} complete")
\ No newline at end of file
+    st.caption(f"{done}/{total} complete")
+
+profile_page_done()
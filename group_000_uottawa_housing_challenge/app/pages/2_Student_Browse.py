@@ -1,13 +1,14 @@
 import streamlit as st
 from app.utils import (
-    inject_css, init_state, get_listings, ensure_selected_listing,
-    compute_price_band, trust_badge, trust_status,
-    listing_meta, is_visible_to_students
+    inject_css, init_state, get_listing, ensure_selected_listing,
+    price_band, trust_badge, trust_status,
+    listing_meta, listing_metas, query_listings, listing_areas, results_window,
+    BED_BUCKETS, BROWSE_PAGE_SIZES, profile_page_done
 )
+from app.geo import commute_label, landmarks, listing_coordinates, distance_km
 
 inject_css()
 init_state()
-df = get_listings()
 st.markdown(
     """
     <div class="hero">
@@ -24,31 +25,36 @@ if st.session_state.role != "student":
     st.info("Switch to Student role from Home (log out and log in as Student).")
     st.stop()
 
-# Funnel visibility
-visible = df[df.apply(is_visible_to_students, axis=1)].copy()
-if visible.empty:
+# Funnel visibility (filter index in memory, or SQL with LISTINGS_DB)
+areas = listing_areas()
+if not areas:
     st.warning("No visible listings yet. (Landlord listings must be Verified/Stale + have photos.)")
     st.stop()
 
 # Filters (clean + minimal)
-c1, c2, c3 = st.columns([1, 1, 1])
+c1, c2, c3, c4 = st.columns([1, 1, 1, 1])
 with c1:
     max_price = st.slider("Max price", 500, 2500, int(st.session_state.profile["budget"]), 25)
 with c2:
-    area = st.selectbox("Area", ["All"] + sorted(visible["area"].unique().tolist()))
+    area = st.selectbox("Area", ["All"] + areas)
 with c3:
-    beds = st.selectbox("Bedrooms", ["Any", "Studio (0)", "1", "2", "3+"])
-
-f = visible[visible["price"] <= max_price]
-if area != "All":
-    f = f[f["area"] == area]
-if beds != "Any":
-    if beds == "Studio (0)":
-        f = f[f["beds"] == 0]
-    elif beds == "3+":
-        f = f[f["beds"] >= 3]
-    else:
-        f = f[f["beds"] == int(beds)]
+    beds = st.selectbox("Bedrooms", ["Any", *BED_BUCKETS])
+with c4:
+    max_commute = st.slider("Max commute (min)", 5, 90, int(st.session_state.profile["commute_max"]), 5)
+
+places = landmarks()
+c5, c6 = st.columns([1, 1])
+with c5:
+    near_name = st.selectbox("Near", ["Anywhere", *places])
+with c6:
+    radius = st.slider("Within (km)", 0.5, 15.0, 2.0, 0.5, disabled=near_name == "Anywhere")
+near = None if near_name == "Anywhere" else (*places[near_name], radius)
+
+f = query_listings(max_price=max_price, area=area, beds=beds, max_commute=max_commute, near=near)
+browse_filters = (max_price, area, beds, max_commute, near, st.session_state.browse_page_size)
+if st.session_state.browse_filters != browse_filters:
+    st.session_state.browse_filters = browse_filters
+    st.session_state.browse_page = 0
 
 if f.empty:
     st.warning("No visible listings match. Try changing filters.")
@@ -60,10 +66,19 @@ left, right = st.columns([1.25, 1])
 
 with left:
     st.markdown("### Results")
-    for _, row in f.sort_values("price").iterrows():
-        band_lo, band_hi = compute_price_band(df, row["area"])
+    # Only the current page is rendered; meta + price bands are resolved for it alone
+    start, stop, page, n_pages = results_window(len(f), st.session_state.browse_page, st.session_state.browse_page_size)
+    st.session_state.browse_page = page
+    window = f.iloc[start:stop]
+    st.caption(f"Showing {start + 1}–{stop} of {len(f)} listings")
+
+    metas = listing_metas(window["id"])
+    if near is not None:
+        away = dict(zip(window["id"], distance_km(*listing_coordinates(window), near[0], near[1], lat0=near[0])))
+    for _, row in window.iterrows():
+        band_lo, band_hi = price_band(row["area"])
         selected = int(row["id"]) == int(st.session_state.selected_listing_id)
-        meta = listing_meta(int(row["id"]))
+        meta = metas[int(row["id"])]
 
         with st.container(border=True):
             st.markdown(f"**{row['title']}**")
@@ -74,7 +89,9 @@ with left:
 
             st.caption(f"📍 {row['area']} • {meta['address']}")
             st.caption(f"📅 Available: {meta['available_date']} • Lease: {meta['lease_length']}")
-            st.caption(f"🖼️ Photos on file: {meta['photo_count']}")
+            st.caption(f"🖼️ Photos on file: {meta['photo_count']} • 🚌 {commute_label(row['commute_min'])}")
+            if near is not None:
+                st.caption(f"📏 {away[row['id']]:.1f} km from {near_name}")
 
             st.markdown(f"### ${int(row['price'])}/mo")
             st.markdown(trust_badge(row["verified_at"]), unsafe_allow_html=True)
@@ -85,11 +102,27 @@ with left:
                 st.session_state.squad["checklist"]["Shortlist 3 listings"] = True
                 st.rerun()
 
+    p1, p2, p3 = st.columns([1, 1.2, 1])
+    with p1:
+        if st.button("← Previous", disabled=page == 0, use_container_width=True):
+            st.session_state.browse_page = page - 1
+            st.rerun()
+    with p2:
+        st.selectbox("Per page", BROWSE_PAGE_SIZES, key="browse_page_size", label_visibility="collapsed")
+        st.caption(f"Page {page + 1} of {n_pages}")
+    with p3:
+        if st.button("Next →", disabled=page >= n_pages - 1, use_container_width=True):
+            st.session_state.browse_page = page + 1
+            st.rerun()
+
 with right:
     st.markdown("### Selected listing")
-    sel = df[df["id"] == int(st.session_state.selected_listing_id)].iloc[0]
+    sel = get_listing(st.session_state.selected_listing_id)
+    if sel is None:
+        st.info("That listing is no longer available.")
+        st.stop()
     meta = listing_meta(int(sel["id"]))
-    band_lo, band_hi = compute_price_band(df, sel["area"])
+    band_lo, band_hi = price_band(sel["area"])
     status, _ = trust_status(sel["verified_at"])
 
     with st.container(border=True):
@@ -115,4 +148,6 @@ with right:
         st.write(f"- Status: **{status}** (decays over time)")
         st.write("- Passed funnel: photos uploaded + not pending")
 
-        st.info("Next: go to **Student Safe Chat** to contact landlord in-platform and trigger the scam interrupt.")
\ No newline at end of file
+        st.info("Next: go to **Student Safe Chat** to contact landlord in-platform and trigger the scam interrupt.")
+
+profile_page_done()
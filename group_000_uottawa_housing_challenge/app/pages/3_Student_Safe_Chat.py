@@ -1,10 +1,9 @@
 import streamlit as st
 from datetime import datetime
-from app.utils import init_state, load_listings, risk_detect
+from app.utils import init_state, load_listings, record_risk_event, profile_page_done
 
 init_state()
-from app.utils import get_listings
-df = get_listings()
+from app.utils import get_listing
 
 st.markdown("## 3) Safe Messaging (Scam Interrupt)")
 
@@ -16,7 +15,10 @@ if st.session_state.selected_listing_id is None:
     st.warning("Select a listing in Browse first.")
     st.stop()
 
-listing = df[df["id"] == int(st.session_state.selected_listing_id)].iloc[0]
+listing = get_listing(st.session_state.selected_listing_id)
+if listing is None:
+    st.warning("That listing is no longer available. Pick another one in Browse.")
+    st.stop()
 
 left, right = st.columns([1.35, 1])
 
@@ -57,18 +59,9 @@ with left:
 
         # Detect risk on last landlord message
         if st.session_state.chat and st.session_state.chat[-1]["sender"] == "landlord":
-            last = st.session_state.chat[-1]["text"]
-            score, hits = risk_detect(last)
+            score, hits = record_risk_event(st.session_state.chat[-1], datetime.now().strftime("%H:%M"))
 
             if hits:
-                excerpt = (last[:70] + "…") if len(last) > 70 else last
-                st.session_state.risk_timeline.append({
-                    "time": datetime.now().strftime("%H:%M"),
-                    "event": "Scam pattern detected",
-                    "score": score,
-                    "excerpt": excerpt
-                })
-
                 st.markdown("<div class='interrupt'>", unsafe_allow_html=True)
                 st.markdown("### ⚠️ Students are often scammed at this step.")
                 st.write("We recommend booking a viewing before paying anything.")
@@ -95,4 +88,6 @@ with right:
         st.caption("Risk events are logged in the sidebar timeline with the exact pattern that triggered it.")
         if st.button("Generate Incident Pack", use_container_width=True):
             st.session_state.incident_pack["ready"] = True
-            st.success("Incident Pack ready (demo). Go to Safety & Lease page.")
\ No newline at end of file
+            st.success("Incident Pack ready (demo). Go to Safety & Lease page.")
+
+profile_page_done()
@@ -1,8 +1,9 @@
 import streamlit as st
-from app.utils import init_state, load_listings, lease_scan
+from app.utils import init_state, get_listing, lease_scan, lease_scan_stream, iter_text_chunks, profile_page_done
+from app.geo import commute_label
+from app.shortlist import shortlist
 
 init_state()
-df = load_listings("data/listings.csv")
 
 st.markdown("## 4) Viewing + Lease Safety Check")
 
@@ -14,7 +15,11 @@ if st.session_state.selected_listing_id is None:
     st.warning("Select a listing in Browse first.")
     st.stop()
 
-listing = df[df["id"] == int(st.session_state.selected_listing_id)].iloc[0]
+listing = get_listing(st.session_state.selected_listing_id)
+if listing is None:
+    st.warning("That listing is no longer available. Pick another one in Browse.")
+    st.stop()
+
 left, right = st.columns([1.25, 1])
 
 with left:
@@ -30,19 +35,23 @@ with left:
     st.divider()
 
     st.markdown("### Lease scan (MVP rules)")
-    st.caption("For MVP: paste lease text. (No PDF parsing.)")
+    st.caption("For MVP: paste lease text or upload a .txt file. (No PDF parsing.)")
     lease_text = st.text_area("Paste lease text here", height=170)
+    lease_file = st.file_uploader("…or upload the lease as a text file", type=["txt"])
 
     if st.button("Run Lease Scan", type="primary"):
-        if not lease_text.strip():
-            st.warning("Paste lease text to scan.")
+        if lease_file is None and not lease_text.strip():
+            st.warning("Paste lease text or upload a file to scan.")
         else:
-            flags = lease_scan(lease_text)
+            # uploaded files are streamed in chunks instead of being loaded into the widget
+            flags = lease_scan_stream(iter_text_chunks(lease_file)) if lease_file is not None else lease_scan(lease_text)
             st.session_state.squad["checklist"]["Upload lease draft (optional)"] = True
             if flags:
                 st.warning("Potential issues found:")
                 for f in flags:
                     st.write(f"**• {f['name']}**")
+                    if "offset" in f:
+                        st.caption(f"First mention at character {f['offset']:,}.")
                     st.caption(f["tip"])
             else:
                 st.success("No obvious flags found by MVP rules. Still review carefully.")
@@ -53,12 +62,13 @@ with right:
         st.write("For the demo, this can simply confirm their constraints and show a shortlist.")
         st.write(f"**Budget:** ${st.session_state.profile['budget']} | **Areas:** {', '.join(st.session_state.profile['areas'] or ['(none)'])}")
         st.write(f"**Move-in:** {st.session_state.profile['move_in']} | **Roommates:** {st.session_state.profile['roommates']}")
+        st.write(f"**Max commute:** {st.session_state.profile['commute_max']} min")
 
-        # Lightweight "matches"
-        matches = df[df["price"] <= int(st.session_state.profile["budget"])].head(12)
+        # visible listings ranked on rent per person, preferred areas, move-in timing and commute
+        matches = shortlist(st.session_state.profile, k=12)
         st.markdown(f"**These {len(matches)} listings match your situation.**")
         for _, r in matches.iterrows():
-            st.write(f"• {r['title']} — {r['area']} — ${int(r['price'])}")
+            st.write(f"• {r['title']} — {r['area']} — ${int(r['price'])} — {commute_label(r['commute_min'])} — {r['match_score']}% fit")
 
     st.markdown("### Incident Pack (one-click generator)")
     with st.container(border=True):
@@ -73,4 +83,6 @@ with right:
             if all(st.session_state.incident_pack["items"].values()):
                 st.success("✅ Pack complete (in a real app: export ZIP / share link).")
             else:
-                st.info("Keep collecting evidence — this prevents 'unpreventable' losses.")
\ No newline at end of file
+                st.info("Keep collecting evidence — this prevents 'unpreventable' losses.")
+
+profile_page_done()
@@ -0,0 +1,44 @@
+import streamlit as st
+from app.utils import init_state, profile_page_done
+from app.roommates import load_roommates, match_roommates
+
+init_state()
+roommates, X = load_roommates("data/roommates.csv")
+
+st.markdown("## 5) Find Roommates to Split Rent")
+
+if st.session_state.role != "student":
+    st.info("Switch to Student role from Home (log out and log in as Student).")
+    st.stop()
+
+left, right = st.columns([1, 1.25])
+
+with left:
+    st.markdown("### Your habits")
+    me = {
+        "cleanliness": st.slider("Cleanliness (1 = relaxed, 10 = spotless)", 1, 10, 7),
+        "noise": st.slider("Noise (1 = silent, 10 = parties)", 1, 10, 4),
+        "sleep_schedule": st.radio("Sleep schedule", ["early", "flexible", "late"], horizontal=True),
+        "budget": st.session_state.profile["budget"],
+        "smoking": "yes" if st.checkbox("I smoke") else "no",
+        "pets": "yes" if st.checkbox("I have / want pets") else "no",
+    }
+    st.caption(f"Budget from your constraints: **${me['budget']}/mo** (change it in Onboarding).")
+    k = st.slider("Show top matches", 1, 20, 5)
+
+with right:
+    st.markdown("### Best matches")
+    matches = match_roommates(me, roommates, X, k=k)
+    if matches.empty:
+        st.info("No roommates in data/roommates.csv yet.")
+    for _, r in matches.iterrows():
+        with st.container(border=True):
+            st.markdown(f"**{r['name']}** — **{r['compatibility']}% match**")
+            st.caption(
+                f"Cleanliness {r['cleanliness']}/10 • Noise {r['noise']}/10 • {str(r['sleep_schedule']).title()} sleeper • "
+                f"${int(r['budget'])}/mo • Smoking: {r['smoking']} • Pets: {r['pets']}"
+            )
+            if isinstance(r.get("notes"), str) and r["notes"].strip():
+                st.write(r["notes"])
+
+profile_page_done()
@@ -1,6 +1,6 @@
 import streamlit as st
 from datetime import datetime
-from app.utils import init_state
+from app.utils import init_state, profile_page_done
 
 init_state()
 
@@ -38,4 +38,6 @@ with st.container(border=True):
             st.error("Please enter a Company/Landlord name.")
         else:
             p["created_at"] = p["created_at"] or datetime.now().strftime("%Y-%m-%d %H:%M")
-            st.success("Onboarding complete. Go to **Landlord Profile** next.")
\ No newline at end of file
+            st.success("Onboarding complete. Go to **Landlord Profile** next.")
+
+profile_page_done()
@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from app.utils import init_state, get_listings, set_listings, trust_badge
+from app.utils import init_state, landlord_listings, update_listing, trust_badge, listings_going_stale, TRUST_SOON_DAYS, profile_page_done
+from app.reconfirm import send_reminders
 
 init_state()
 st.markdown("## Landlord Profile")
@@ -11,7 +12,6 @@ if st.session_state.role != "landlord":
     st.stop()
 
 p = st.session_state.landlord_profile
-df = get_listings()
 
 if not p["company_name"].strip():
     st.warning("No landlord profile yet. Go to **Landlord Onboarding** first.")
@@ -29,15 +29,24 @@ with st.container(border=True):
     st.write(" | ".join(ver))
     st.caption(f"Created: {p.get('created_at') or '(demo)'}")
 
-# Filter listings owned by this landlord name (simple MVP)
-owned = df[df["landlord"].str.lower() == p["company_name"].strip().lower()].copy()
+# Listings owned by this landlord name (simple MVP), via the landlord index
+owned = landlord_listings(p["company_name"])
 
 st.markdown("### Your listings")
+if not owned.empty and st.button("Send reconfirmation reminders for all due listings"):
+    send_reminders(owned)
+soon = listings_going_stale(landlord=p["company_name"])
+if not soon.empty:
+    st.warning(
+        f"⏳ {len(soon)} listing(s) turn Stale within {TRUST_SOON_DAYS} days: "
+        + ", ".join(soon["title"].astype(str))
+        + ". Confirm availability to keep them Verified."
+    )
 if owned.empty:
     st.info("No listings found for this landlord name in data/listings.csv.")
     st.caption("MVP tip: set your Company/Landlord name to match an existing listing landlord value (e.g., 'Private Landlord').")
 else:
-    for _, row in owned.sort_values("id").iterrows():
+    for _, row in owned.iterrows():
         with st.container(border=True):
             st.markdown(f"**{row['title']}** — {row['area']} — **${int(row['price'])}/mo**")
             st.markdown(trust_badge(row["verified_at"]), unsafe_allow_html=True)
@@ -45,10 +54,11 @@ else:
             c1, c2 = st.columns([1, 1])
             with c1:
                 if st.button("Confirm availability (re-verify)", key=f"reverify_{row['id']}", type="primary", use_container_width=True):
-                    df.loc[df["id"] == row["id"], "verified_at"] = pd.Timestamp.now().normalize()
-                    set_listings(df)
+                    update_listing(int(row["id"]), verified_at=pd.Timestamp.now().normalize())
                     st.success("Availability confirmed. Badge refreshed to Verified (demo).")
                     st.rerun()
             with c2:
                 if st.button("Send reconfirmation email (demo)", key=f"email_{row['id']}", use_container_width=True):
-                    st.info("Sent email: 'Please reconfirm availability' (demo).")
\ No newline at end of file
+                    send_reminders(owned, listing_id=row["id"])
+
+profile_page_done()
@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
-from app.utils import init_state, get_listings, set_listings, trust_badge, listing_meta, mark_verified
+from app.utils import init_state, landlord_listings, trust_badge, listing_metas, confirm_availability, profile_page_done
+from app.reconfirm import send_reminders
 
 init_state()
 st.markdown("## Landlord Profile")
@@ -11,7 +11,6 @@ if st.session_state.role != "landlord":
     st.stop()
 
 p = st.session_state.landlord_profile
-df = get_listings()
 
 if not p["company_name"].strip():
     st.warning("No landlord profile yet. Go to **Landlord Onboarding** first.")
@@ -36,22 +35,47 @@ with st.container(border=True):
     if missing:
         st.warning("To make listings visible you must complete: " + ", ".join(missing))
 
-# Filter listings owned by this landlord name (simple MVP)
-owned = df[df["landlord"].str.lower() == p["company_name"].strip().lower()].copy()
+# Listings owned by this landlord name (simple MVP), via the landlord index
+owned = landlord_listings(p["company_name"])
 
 st.markdown("### Your listings")
+if not owned.empty and st.button("Send reconfirmation reminders for all due listings"):
+    send_reminders(owned)
+if not owned.empty:
+    with st.expander("Confirm availability for many listings"):
+        titles = dict(zip(owned["id"].tolist(), owned["title"]))
+        selected = st.multiselect(
+            "Listings to confirm",
+            list(titles),
+            format_func=lambda i: f"#{i} {titles[i]}",
+            key="bulk_confirm_ids",
+        )
+        if st.button("Confirm all selected", type="primary", disabled=not selected):
+            res = confirm_availability(selected)
+            if not res["profile_ok"]:
+                st.error("Complete verification first: email + phone + card on file.")
+            else:
+                if res["confirmed"]:
+                    st.success(f"Availability confirmed for {len(res['confirmed'])} listing(s).")
+                    owned = landlord_listings(p["company_name"])
+                if res["missing_photos"]:
+                    st.warning(
+                        "Missing photos (required to be visible), not confirmed: "
+                        + ", ".join(f"#{i}" for i in res["missing_photos"])
+                    )
 if owned.empty:
     st.info("No listings found for this landlord name in data/listings.csv.")
     st.caption("MVP tip: set your Company/Landlord name to match an existing listing landlord value (e.g., 'Private Landlord').")
 else:
-    for _, row in owned.sort_values("id").iterrows():
-        meta = listing_meta(int(row["id"]))
+    metas = listing_metas(owned["id"])
+    for _, row in owned.iterrows():
+        meta = metas[int(row["id"])]
 
         with st.container(border=True):
             st.markdown(f"**{row['title']}** — {row['area']} — **${int(row['price'])}/mo**")
             st.markdown(trust_badge(row["verified_at"]), unsafe_allow_html=True)
             st.caption(f"📍 {meta.get('address','—')} • 📅 {meta.get('available_date','—')} • Lease: {meta.get('lease_length','—')}")
-            st.caption("📷 Photos: " + ("✅ Uploaded" if meta.get("photos_ok") else "❌ Missing (required)"))
+            st.caption("📷 Photos: " + ("✅ Uploaded" if int(row.get("photo_count") or 0) >= 1 else "❌ Missing (required)"))
             st.caption("📝 Lease draft: " + ("✅ Uploaded" if meta.get("lease_uploaded") else "— Not uploaded"))
 
             c1, c2 = st.columns([1, 1])
@@ -64,19 +88,19 @@ else:
                     use_container_width=True
                 ):
                     # Funnel requirement before visibility
-                    if not (p["email_verified"] and p["phone_verified"] and p["card_on_file"]):
+                    res = confirm_availability([int(row["id"])])
+                    if not res["profile_ok"]:
                         st.error("Complete verification first: email + phone + card on file.")
                         st.stop()
-                    if not meta.get("photos_ok", False):
+                    if res["missing_photos"]:
                         st.error("This listing is missing photos. Photos are mandatory to be visible.")
                         st.stop()
 
-                    df.loc[df["id"] == row["id"], "verified_at"] = pd.Timestamp.now().normalize()
-                    set_listings(df)
-                    mark_verified(int(row["id"]))
                     st.success("Availability confirmed. Listing is now ✅ visible to students.")
                     st.rerun()
 
             with c2:
                 if st.button("Send reconfirmation email (demo)", key=f"email_{row['id']}", use_container_width=True):
-                    st.info("Sent email: 'Please reconfirm availability' (demo).")
\ No newline at end of file
+                    send_reminders(owned, listing_id=row["id"])
+
+profile_page_done()
@@ -0,0 +1,215 @@
+"""
+Batch reconfirmation reminders for landlords.
+
+Selects every listing that is about to go Stale or already past it, groups them by landlord
+and writes one reminder per landlord into a local outbox directory (standing in for the mail
+service). Reminders are rendered + delivered by a bounded thread pool; a failed delivery is
+retried with exponential backoff, and a run stops starting new deliveries once its deadline
+passes, so a nightly run over the whole catalog finishes in bounded time.
+
+Run from the project folder (uses LISTINGS_DB when set, else data/listings.csv):
+    python -m app.reconfirm --outbox data/outbox --workers 8 --deadline 600
+
+One file per landlord, day and set of listings, written atomically, so re-running the same
+night overwrites instead of sending duplicates.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app.utils import (
+    TRUST_SOON_DAYS, TRUST_STALE_DAYS, advance_trust_schedule, build_trust_schedule, get_listings,
+    landlord_key, schedule_rows_due, trust_schedule,
+)
+
+OUTBOX_DIR = "data/outbox"
+RECONFIRM_WORKERS = 8
+RECONFIRM_RETRIES = 3       # attempts after the first one
+RECONFIRM_BACKOFF = 0.2     # seconds before the first retry; doubles every retry
+RECONFIRM_DEADLINE = 600    # seconds; deliveries not started by then are reported as skipped
+
+
+def select_for_reconfirmation(
+    df: pd.DataFrame, within_days: int = TRUST_SOON_DAYS, now: pd.Timestamp = None, schedule: dict = None,
+) -> pd.DataFrame:
+    """
+    Live (not pending, verified at least once) listings that turn Stale within `within_days`
+    days or already have, with `trust_status` and `days_since` columns. Rows come from the
+    trust schedule (`schedule`, whose rows are df's rows; built for df when not given), so
+    only the rows that are due are touched.
+    """
+    if schedule is None:
+        schedule = build_trust_schedule(df)
+    advance_trust_schedule(schedule, now)
+    day = schedule["day"]
+    rows = schedule_rows_due(schedule, within_days)
+    if "pending" in df.columns:
+        rows = rows[~df["pending"].to_numpy(dtype=bool)[rows]]
+
+    out = df.iloc[rows].copy()
+    out["days_since"] = day - (schedule["stale_at"][rows] - TRUST_STALE_DAYS - 1)
+    out["trust_status"] = schedule["status"][rows]
+    return out
+
+
+def group_by_landlord(due: pd.DataFrame) -> list:
+    """[(landlord display name, that landlord's due rows oldest-first)], landlords matched like landlord_key()."""
+    # one sort for everyone, then each landlord is a contiguous slice
+    due = due.assign(_key=due["landlord"].map(landlord_key))
+    due = due.sort_values(["_key", "days_since"], ascending=[True, False], kind="stable")
+    keys = due.pop("_key").to_numpy()
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=int)
+    ends = np.r_[starts[1:], len(keys)].astype(int)
+    return [(str(due["landlord"].iloc[a]).strip(), due.iloc[a:b]) for a, b in zip(starts, ends)]
+
+
+def render_reminder(landlord: str, rows: pd.DataFrame, now: pd.Timestamp = None) -> dict:
+    """The reminder message for one landlord."""
+    now = now if now is not None else pd.Timestamp.now()
+    lines = [
+        f"- {r['title']} ({r['area']}, ${int(r['price'])}/mo): {r['trust_status']}, last confirmed {r['days_since']}d ago"
+        for r in rows.to_dict("records")
+    ]
+    return {
+        "to": landlord,
+        "subject": f"Please reconfirm availability for {len(rows)} listing(s)",
+        "body": (
+            f"Hi {landlord},\n\n"
+            "Students only see listings whose availability was confirmed recently. "
+            "These listings need a quick reconfirmation:\n"
+            + "\n".join(lines)
+            + "\n\nOpen your Landlord Profile and click \"Confirm availability\" on each one.\n"
+        ),
+        "listing_ids": [int(i) for i in rows["id"]],
+        "created_at": now.isoformat(timespec="seconds"),
+    }
+
+
+def outbox_path(outbox: str, message: dict) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", landlord_key(message["to"])).strip("-") or "landlord"
+    digest = hashlib.sha1(",".join(map(str, sorted(message["listing_ids"]))).encode()).hexdigest()[:8]
+    return os.path.join(outbox, f"{message['created_at'][:10]}_{slug}_{digest}.json")
+
+
+def deliver(message: dict, outbox: str = OUTBOX_DIR) -> str:
+    """Write one message to the outbox (tmp file + rename, so readers never see half a message)."""
+    path = outbox_path(outbox, message)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(message, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def _send_with_retry(message: dict, outbox: str, send, retries: int, backoff: float) -> dict:
+    """Worker task: returns {"ok", "attempts", "error"}; never raises."""
+    for attempt in range(retries + 1):
+        try:
+            send(message, outbox)
+            return {"ok": True, "attempts": attempt + 1, "error": None}
+        except Exception as e:  # any send failure is recorded, never raised into the pool
+            if attempt == retries:
+                return {"ok": False, "attempts": attempt + 1, "error": str(e)}
+            time.sleep(backoff * 2 ** attempt)
+
+
+def run_reconfirmation(
+    df: pd.DataFrame,
+    outbox: str = OUTBOX_DIR,
+    workers: int = RECONFIRM_WORKERS,
+    within_days: int = TRUST_SOON_DAYS,
+    retries: int = RECONFIRM_RETRIES,
+    backoff: float = RECONFIRM_BACKOFF,
+    deadline: float = RECONFIRM_DEADLINE,
+    now: pd.Timestamp = None,
+    send=deliver,
+    schedule: dict = None,
+) -> dict:
+    """
+    Select -> group -> render + deliver reminders for the listings in df. Returns run metrics:
+    listings / landlords selected, sent / failed / skipped messages, retries, seconds, messages/s.
+    `send(message, outbox)` is the delivery step (deliver() writes the outbox directory);
+    `schedule` is df's trust schedule when the caller already has one (see trust_schedule()).
+    """
+    t0 = time.perf_counter()
+    os.makedirs(outbox, exist_ok=True)
+    due = select_for_reconfirmation(df, within_days, now, schedule)
+    groups = group_by_landlord(due)
+
+    def task(group):
+        if time.perf_counter() - t0 > deadline:
+            return None  # out of time: skipped, picked up by the next run
+        return _send_with_retry(render_reminder(*group, now=now), outbox, send, retries, backoff)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(task, groups))
+
+    done = [r for r in results if r is not None]
+    elapsed = time.perf_counter() - t0
+    sent = sum(r["ok"] for r in done)
+    return {
+        "listings": len(due),
+        "landlords": len(groups),
+        "sent": sent,
+        "failed": len(done) - sent,
+        "skipped": len(results) - len(done),
+        "retries": sum(r["attempts"] - 1 for r in done),
+        "errors": [r["error"] for r in done if not r["ok"]][:10],
+        "seconds": round(elapsed, 3),
+        "messages_per_s": round(sent / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def send_reminders(owned: pd.DataFrame, listing_id: int = None) -> dict:
+    """
+    The landlord pages' reminder buttons: remind about every due listing in `owned`, or, with
+    `listing_id`, about that one listing even if it is not due yet. Shows the outcome on the
+    page and returns the run metrics.
+    """
+    if listing_id is None:
+        m = run_reconfirmation(owned)
+        if m["failed"]:
+            st.error(f"{m['failed']} reminder(s) could not be delivered: {'; '.join(m['errors'])}")
+        elif m["listings"]:
+            st.success(f"Reminder for {m['listings']} listing(s) sent to the demo outbox ({OUTBOX_DIR}) in {m['seconds']}s.")
+        else:
+            st.info(f"Nothing due: no listing turns Stale within {TRUST_SOON_DAYS} days.")
+        return m
+
+    # any confirmed listing can be reminded about by hand, not only the due ones
+    m = run_reconfirmation(owned[owned["id"] == listing_id], within_days=TRUST_STALE_DAYS + 1)
+    if m["failed"]:
+        st.error(f"The reminder could not be delivered: {m['errors'][0]}")
+    elif m["sent"]:
+        st.info(f"Sent email: 'Please reconfirm availability' (demo outbox: {OUTBOX_DIR}).")
+    else:
+        st.warning("Nothing to reconfirm yet: this listing has never been verified.")
+    return m
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write reconfirmation reminders for stale / soon-stale listings.")
+    parser.add_argument("--outbox", default=OUTBOX_DIR)
+    parser.add_argument("--workers", type=int, default=RECONFIRM_WORKERS)
+    parser.add_argument("--within-days", type=int, default=TRUST_SOON_DAYS)
+    parser.add_argument("--retries", type=int, default=RECONFIRM_RETRIES)
+    parser.add_argument("--deadline", type=float, default=RECONFIRM_DEADLINE, help="seconds")
+    args = parser.parse_args()
+
+    metrics = run_reconfirmation(
+        get_listings(), outbox=args.outbox, workers=args.workers, within_days=args.within_days,
+        retries=args.retries, deadline=args.deadline, schedule=trust_schedule(),
+    )
+    print(json.dumps(metrics, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Backfill risk scoring for whole chat histories.
+
+The Safe Chat page only scores the newest landlord message. This scores every landlord
+message in an exported chat log (JSONL, one {"sender", "text", "ts"} per line -- the same
+shape as st.session_state.chat) and writes the resulting risk_timeline events as JSONL.
+
+Run from the project folder:
+    python -m app.risk_backfill chat.jsonl --out risk_timeline.jsonl --workers 4
+
+Messages are split into fixed-size chunks and scored with a process pool. Results are
+collected in input order, so the output is identical whatever the worker count.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from app.utils import risk_detect, risk_event
+
+BACKFILL_CHUNK = 512  # messages per worker task
+
+
+def load_chat_log(path: str) -> list:
+    """Read a JSONL chat export; blank lines are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _score_texts(texts: list) -> list:
+    """Worker task: scores only, so just ints cross the process boundary."""
+    return [risk_detect(t)[0] for t in texts]
+
+
+def backfill_risk_timeline(chat: list, workers: int = None, chunk_size: int = BACKFILL_CHUNK) -> list:
+    """
+    Risk timeline events for every flagged landlord message in `chat`, in chat order.
+    workers=1 scores in-process; otherwise a process pool of `workers` (default: CPU count).
+    """
+    landlord = [m for m in chat if m.get("sender") == "landlord"]
+    texts = [m.get("text") or "" for m in landlord]
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+    if workers == 1 or len(chunks) <= 1:
+        scored = [_score_texts(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scored = list(pool.map(_score_texts, chunks))  # map() keeps submission order
+
+    scores = [s for chunk in scored for s in chunk]
+    return [
+        risk_event(text, score, msg.get("ts", ""))
+        for msg, text, score in zip(landlord, texts, scores)
+        if score > 0
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Risk-score every landlord message in a chat log.")
+    parser.add_argument("chat_log", help="JSONL file of {sender, text, ts} messages")
+    parser.add_argument("--out", default=None, help="output JSONL (default: <chat_log>.risk_timeline.jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    chat = load_chat_log(args.chat_log)
+    events = backfill_risk_timeline(chat, workers=args.workers)
+
+    out = args.out or os.path.splitext(args.chat_log)[0] + ".risk_timeline.jsonl"
+    with open(out, "w", encoding="utf-8") as f:
+        for e in events:
+            f.write(json.dumps(e, ensure_ascii=False) + "\n")
+    print(f"Scored {sum(m.get('sender') == 'landlord' for m in chat)} landlord messages, "
+          f"{len(events)} risk events -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Roommate compatibility matching on data/roommates.csv.
+
+Every roommate becomes one row of a numeric feature matrix (each feature scaled to 0..1),
+so scoring a student against all candidates is a single weighted-distance pass and the
+best k come out of np.argpartition -- no per-candidate Python loop, no full sort.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app.ranking import top_k
+
+ROOMMATES_CSV = "data/roommates.csv"
+
+# feature -> weight in the compatibility distance (lifestyle clashes weigh more than budget)
+ROOMMATE_WEIGHTS = {
+    "cleanliness": 3.0,
+    "noise": 2.0,
+    "sleep_schedule": 2.0,
+    "budget": 1.5,
+    "smoking": 3.0,
+    "pets": 1.0,
+}
+ROOMMATE_FEATURES = tuple(ROOMMATE_WEIGHTS)
+SLEEP_SCHEDULES = {"early": 0.0, "flexible": 0.5, "late": 1.0}
+ROOMMATE_BUDGET_SPAN = 400  # a budget gap this large ($/mo) counts as a full mismatch
+UNKNOWN_GAP = 0.5           # distance used when either side left a feature blank
+
+
+def _yes_no(s: pd.Series) -> np.ndarray:
+    v = s.astype(str).str.strip().str.lower()
+    return np.where(v.isin(["yes", "y", "true", "1"]), 1.0, np.where(v.isin(["no", "n", "false", "0"]), 0.0, np.nan))
+
+
+def roommate_features(df: pd.DataFrame) -> np.ndarray:
+    """(n, len(ROOMMATE_FEATURES)) float matrix, columns in ROOMMATE_FEATURES order; NaN = unknown."""
+    X = np.full((len(df), len(ROOMMATE_FEATURES)), np.nan)
+    if "cleanliness" in df.columns:
+        X[:, 0] = pd.to_numeric(df["cleanliness"], errors="coerce") / 10.0
+    if "noise" in df.columns:
+        X[:, 1] = pd.to_numeric(df["noise"], errors="coerce") / 10.0
+    if "sleep_schedule" in df.columns:
+        X[:, 2] = df["sleep_schedule"].astype(str).str.strip().str.lower().map(SLEEP_SCHEDULES).to_numpy(dtype=float)
+    if "budget" in df.columns:
+        X[:, 3] = pd.to_numeric(df["budget"], errors="coerce") / ROOMMATE_BUDGET_SPAN
+    if "smoking" in df.columns:
+        X[:, 4] = _yes_no(df["smoking"])
+    if "pets" in df.columns:
+        X[:, 5] = _yes_no(df["pets"])
+    return X
+
+
+@st.cache_data
+def load_roommates(csv_path: str = ROOMMATES_CSV):
+    """The roommate table plus its feature matrix (row i of the matrix is row i of the table)."""
+    df = pd.read_csv(csv_path).reset_index(drop=True)
+    return df, roommate_features(df)
+
+
+def compatibility_scores(student: dict, X: np.ndarray) -> np.ndarray:
+    """
+    0-100 compatibility of `student` (a dict with the roommates.csv columns) against every row
+    of X: 100 minus the weighted mean per-feature gap, each gap capped at 1.
+    """
+    s = roommate_features(pd.DataFrame([student]))[0]
+    w = np.array([ROOMMATE_WEIGHTS[f] for f in ROOMMATE_FEATURES])
+
+    gap = np.abs(X - s)
+    np.minimum(gap, 1.0, out=gap)
+    gap[np.isnan(gap)] = UNKNOWN_GAP
+    return 100.0 * (1.0 - gap @ (w / w.sum()))
+
+
+def match_roommates(student: dict, roommates: pd.DataFrame, X: np.ndarray, k: int = 5) -> pd.DataFrame:
+    """Top-k roommates for `student`, best first, with a `compatibility` column (0-100)."""
+    scores = compatibility_scores(student, X)
+    best = top_k(scores, k)
+    out = roommates.iloc[best].copy()
+    out["compatibility"] = np.round(scores[best]).astype(int)
+    return out
@@ -0,0 +1,120 @@
+"""
+Ranked listing shortlist for a student profile (the Final Safety Check on the Safety page).
+
+Only funnel-visible listings are ranked. The per-listing columns the scores need (price,
+area, available date as epoch days, commute minutes) are derived once per listings version
+and day, so a match is a few vectorized passes over arrays plus np.argpartition for the best k.
+"""
+import numpy as np
+import pandas as pd
+
+from app.ranking import top_k
+from app.geo import resolve_area
+from app.utils import listing_filter_index, versioned_cache
+
+# score component -> weight (staying in budget matters most, then area, then timing / commute)
+MATCH_WEIGHTS = {"price": 2.0, "area": 1.5, "move_in": 1.0, "commute": 1.0}
+MATCH_MOVE_IN_SPAN = 60  # days between available_date and move-in that count as a full mismatch
+MATCH_UNKNOWN_GAP = 0.5  # gap used when a listing has no usable available_date / known commute
+
+
+def _epoch_days(values) -> np.ndarray:
+    """Dates -> float days since the epoch (NaN where missing / unparseable)."""
+    ts = pd.to_datetime(pd.Series(values), errors="coerce").to_numpy("datetime64[D]")
+    out = ts.astype(np.int64).astype(float)
+    out[np.isnat(ts)] = np.nan
+    return out
+
+
+def build_match_features(index: dict) -> dict:
+    """
+    Scoring columns over a listing filter index (its `rows` are the visible listings):
+      prices     -- monthly rent per listing
+      area_codes -- codes into `areas`, the distinct area names
+      available  -- available_date in epoch days (NaN = unknown)
+      commute    -- minutes to campus (NaN = unknown), from the index
+    """
+    rows = index["rows"]
+    codes, areas = pd.factorize(rows["area"].astype(str))
+    return {
+        "rows": rows,
+        "prices": index["prices"],
+        "area_codes": codes,
+        "areas": pd.Index(areas),
+        "available": _epoch_days(rows["available_date"]) if "available_date" in rows.columns else np.full(len(rows), np.nan),
+        "commute": index["commute"],
+    }
+
+
+def listing_match_features(now: pd.Timestamp = None) -> dict:
+    """build_match_features() for the current visible listings, rebuilt per listings version and day."""
+    now = now if now is not None else pd.Timestamp.now()
+    index = listing_filter_index(now)
+    return versioned_cache("listing_match_features", build_match_features, day=f"{now:%Y-%m-%d}", source=lambda: index)
+
+
+def match_scores(profile: dict, features: dict) -> np.ndarray:
+    """
+    0-100 fit of every listing in `features` for a student profile (budget, areas, move_in,
+    roommates, commute_max): 100 minus the weighted mean of four gaps, each in 0..1 --
+      price   -- rent per person (profile["roommates"] people share it) as a share of budget
+      area    -- 0 in a preferred area (or when none are picked), else 1; both sides are
+                 compared through resolve_area(), so "The Glebe" matches "Glebe" listings
+      move_in -- days between available_date and move-in, over MATCH_MOVE_IN_SPAN
+      commute -- minutes to campus as a share of commute_max
+    Listings over budget per person, or with a known commute over commute_max, score -inf
+    (never shortlisted).
+    """
+    people = max(1, int(profile.get("roommates") or 1))
+    budget = float(profile.get("budget") or 0)
+    share = features["prices"] / people
+
+    price_gap = np.minimum(share / budget, 1.0) if budget > 0 else np.ones(len(share))
+
+    wanted = {k for a in profile.get("areas") or [] for k in resolve_area(a)}
+    if wanted:
+        # one resolve per distinct area, then a lookup by code (-1 = missing area, never wanted)
+        hit = np.array([bool(wanted.intersection(resolve_area(a))) for a in features["areas"]] + [False])
+        area_gap = (~hit[features["area_codes"]]).astype(float)
+    else:
+        area_gap = np.zeros(len(share))
+
+    move_in = profile.get("move_in")
+    if move_in is not None:
+        move_in_gap = np.minimum(np.abs(features["available"] - _epoch_days([move_in])[0]) / MATCH_MOVE_IN_SPAN, 1.0)
+        move_in_gap[np.isnan(move_in_gap)] = MATCH_UNKNOWN_GAP
+    else:
+        move_in_gap = np.full(len(share), MATCH_UNKNOWN_GAP)
+
+    commute_max = float(profile.get("commute_max") or 0)
+    commute = features["commute"]
+    if commute_max > 0:
+        commute_gap = np.minimum(commute / commute_max, 1.0)
+        commute_gap[np.isnan(commute_gap)] = MATCH_UNKNOWN_GAP
+    else:
+        commute_gap = np.full(len(share), MATCH_UNKNOWN_GAP)
+
+    w = MATCH_WEIGHTS
+    gap = (
+        w["price"] * price_gap + w["area"] * area_gap + w["move_in"] * move_in_gap + w["commute"] * commute_gap
+    ) / sum(w.values())
+    scores = 100.0 * (1.0 - gap)
+    scores[~(share <= budget)] = -np.inf  # NaN prices count as over budget
+    if commute_max > 0:
+        scores[commute > commute_max] = -np.inf  # unknown commutes stay in, like the Browse filter
+    return scores
+
+
+def rank_listings(profile: dict, features: dict, k: int = 12) -> pd.DataFrame:
+    """Top-k listings for `profile`, best first, with a `match_score` column (0-100)."""
+    scores = match_scores(profile, features)
+    best = top_k(scores, k)
+    best = best[np.isfinite(scores[best])]
+    out = features["rows"].iloc[best].copy()
+    out["match_score"] = np.round(scores[best]).astype(int)
+    return out
+
+
+def shortlist(profile: dict, k: int = 12, now: pd.Timestamp = None) -> pd.DataFrame:
+    """rank_listings() over the session's visible listings."""
+    return rank_listings(profile, listing_match_features(now), k)
@@ -2,28 +2,62 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import re
+import os
+import codecs
+import itertools
+import functools
+import hashlib
+import json
+import sys
+import time
+import heapq
+import threading
+from collections import deque
 from datetime import date, timedelta
 
+from app.geo import (
+    KM_PER_DEG_LAT, KM_PER_DEG_LON_EQUATOR, build_spatial_index, commute_minutes, distance_km, geocode,
+    geocoder_files, listing_coordinates, spatial_within,
+)
+from app.listings_db import (
+    LISTINGS_DB_COLUMNS, db_connection, db_frame, db_insert, db_row, db_value, db_write, landlord_key,
+)
+
 # ---------- CONFIG ----------
+LISTINGS_CSV = "data/listings.csv"
+CATALOG_SCHEMA_VERSION = "3"  # bump when normalize_listings() output changes; stale compiled files are ignored
 TRUST_STALE_DAYS = 7
 TRUST_UNVERIFIED_DAYS = 14
-
+LEASE_SCAN_CHUNK = 64 * 1024   # characters read per chunk when streaming a lease file
+LEASE_SCAN_OVERLAP = 256       # must be longer than any single lease-flag match
+RISK_TIMELINE_MAX = 50         # risk events kept per session (oldest drop off)
+RISK_MEMO_SIZE = 1024          # distinct messages whose risk_detect() result is memoized
+# Opt-in timing of core helpers + page reruns (APP_PROFILE=1 streamlit run app/Home.py)
+PROFILE_ENABLED = os.environ.get("APP_PROFILE", "") not in ("", "0")
+PROFILE_SAMPLES = 2048         # latest timings kept per helper / page for p50/p95
+
+# "keywords": cheap prefilter -- the pattern can only match if one of these (lowercase)
+# substrings is in the message (compile_rules checks that against the pattern). Leave it out
+# and the rule's regex always runs.
 RISK_RULES = [
     {
         "name": "Deposit before viewing",
         "pattern": r"\b(deposit|down\s*payment|first\s*month)\b.*\b(before|prior)\b.*\b(viewing|tour|see)\b|\bbefore\s*(you\s*)?(see|view)\b.*\bdeposit\b",
+        "keywords": ["deposit", "down", "first"],
         "score": 45,
         "why": "Asking for money before you view is a common scam pattern."
     },
     {
         "name": "Urgency language",
         "pattern": r"\b(today\s*only|right\s*now|immediately|asap|many\s+people|lots\s+of\s+interest|someone\s+else|last\s+chance|hold\s+it\s+for\s+you)\b",
+        "keywords": ["today", "right", "immediately", "asap", "many", "lots", "someone", "last", "hold"],
         "score": 25,
         "why": "Artificial urgency pressures students into irreversible mistakes."
     },
     {
         "name": "Off-platform payment",
         "pattern": r"\b(whatsapp|telegram|wire\s*transfer|gift\s*card|western\s*union|crypto|bitcoin|pay\s*outside|cash\s*only)\b",
+        "keywords": ["whatsapp", "telegram", "wire", "gift", "western", "crypto", "bitcoin", "pay", "cash"],
         "score": 40,
         "why": "Off-platform payment is harder to dispute and often used in scams."
     }
@@ -52,6 +86,104 @@ LEASE_FLAG_RULES = [
     },
 ]
 
+# ---------- PROFILING (opt-in, APP_PROFILE=1) ----------
+# Process-wide: count, latest PROFILE_SAMPLES durations and returned DataFrame sizes per name.
+# With profiling off, @profiled returns the function untouched, so it costs nothing.
+_PROFILE = {}
+_PROFILE_LOCK = threading.Lock()
+
+
+def profile_record(name: str, seconds: float, frame_bytes: int = None):
+    with _PROFILE_LOCK:
+        entry = _PROFILE.setdefault(name, {
+            "count": 0, "samples": deque(maxlen=PROFILE_SAMPLES), "frame_bytes": None, "max_frame_bytes": None,
+        })
+        entry["count"] += 1
+        entry["samples"].append(seconds)
+        if frame_bytes is not None:
+            entry["frame_bytes"] = frame_bytes
+            entry["max_frame_bytes"] = max(frame_bytes, entry["max_frame_bytes"] or 0)
+
+
+def profiled(name: str = None):
+    """Time every call of the decorated helper (and the size of a returned DataFrame) when profiling is on."""
+    def wrap(fn):
+        if not PROFILE_ENABLED:
+            return fn
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            result = None
+            try:
+                result = fn(*args, **kwargs)
+                return result
+            finally:
+                size = int(result.memory_usage(index=True, deep=False).sum()) if isinstance(result, pd.DataFrame) else None
+                profile_record(label, time.perf_counter() - t0, size)
+        return timed
+    return wrap
+
+
+def profile_stats() -> dict:
+    """{name: count, p50_ms, p95_ms, total_ms (over kept samples), last / max DataFrame bytes}."""
+    with _PROFILE_LOCK:
+        snapshot = {k: dict(v, samples=np.array(v["samples"])) for k, v in _PROFILE.items()}
+    out = {}
+    for name, v in sorted(snapshot.items()):
+        ms = v["samples"] * 1000.0
+        out[name] = {
+            "count": v["count"],
+            "p50_ms": round(float(np.percentile(ms, 50)), 3),
+            "p95_ms": round(float(np.percentile(ms, 95)), 3),
+            "total_ms": round(float(ms.sum()), 3),
+            "frame_bytes": v["frame_bytes"],
+            "max_frame_bytes": v["max_frame_bytes"],
+        }
+    return out
+
+
+def profile_json() -> str:
+    return json.dumps({"generated_at": pd.Timestamp.now().isoformat(timespec="seconds"), "stats": profile_stats()}, indent=2)
+
+
+def profile_reset():
+    with _PROFILE_LOCK:
+        _PROFILE.clear()
+
+
+def _page_name(depth: int = 2) -> str:
+    """Name of the page script calling into utils (its file name)."""
+    path = sys._getframe(depth).f_globals.get("__file__") or "page"
+    return "page:" + os.path.splitext(os.path.basename(path))[0]
+
+
+def render_profile_sidebar():
+    """Sidebar debug panel (stats so far + JSON export); init_state() shows it when profiling is on."""
+    with st.sidebar.expander("⏱️ Profiler", expanded=False):
+        stats = profile_stats()
+        if stats:
+            st.dataframe(pd.DataFrame(stats).T, use_container_width=True)
+        else:
+            st.caption("No timings yet.")
+        st.download_button("Export JSON", profile_json(), file_name="profile.json", mime="application/json", key="profile_export")
+        if st.button("Reset profiler", key="profile_reset"):
+            profile_reset()
+
+
+def profile_page_done():
+    """
+    Call last on a page: records the page's rerun time since its init_state() call.
+    Reruns cut short by st.stop() never get here and are not timed.
+    """
+    if not PROFILE_ENABLED:
+        return
+    start = st.session_state.pop("_profile_page_start", None)
+    if start is not None:
+        profile_record(start[0], time.perf_counter() - start[1])
+
+
 # ---------- UI STYLE ----------
 def inject_css():
     # NOTE: this expects you already have the plum theme CSS you liked.
@@ -73,6 +205,9 @@ def inject_css():
 
 # ---------- STATE ----------
 def init_state():
+    if PROFILE_ENABLED:
+        st.session_state["_profile_page_start"] = (_page_name(), time.perf_counter())
+        render_profile_sidebar()
     st.session_state.setdefault("auth", False)
     st.session_state.setdefault("role", "student")  # student | landlord
 
@@ -98,7 +233,7 @@ def init_state():
     })
 
     st.session_state.setdefault("selected_listing_id", None)
-    st.session_state.setdefault("risk_timeline", [])  # list of dicts
+    st.session_state.setdefault("risk_timeline", deque(maxlen=RISK_TIMELINE_MAX))  # ring buffer of dicts
     st.session_state.setdefault("chat", [])           # list of dicts
     st.session_state.setdefault("incident_pack", {
         "ready": False,
@@ -131,20 +266,43 @@ def init_state():
     })
 
     # Listings stored in-session (so landlord can create + verify listings)
-    st.session_state.setdefault("listings_override", None)
+    st.session_state.setdefault("listings_override", None)   # full frame from set_listings() (None = shared catalog)
+    st.session_state.setdefault("listings_appended", None)   # small frame of this session's appended rows
+    st.session_state.setdefault("listings_overlay", {})      # {column: {listing id: value}} edits
+    st.session_state.setdefault("listings_version", 0)  # bumped on every listings change
 
     # Demo listing metadata stored separately by id (safe for “Unknown” fields)
-    st.session_state.setdefault("listing_meta", {})  # {id: {address, available_date, lease_length, photo_count, ...}}
+    # columnar: index = listing id, columns = address, available_date, lease_length, photo_count, ...
+    st.session_state.setdefault("listing_meta", pd.DataFrame(columns=list(LISTING_META_FIELDS), dtype=object))
+
+    # Browse results window: page size + cursor (back to page 0 when filters or page size change)
+    st.session_state.setdefault("browse_page_size", BROWSE_PAGE_SIZES[0])
+    st.session_state.setdefault("browse_page", 0)
+    st.session_state.setdefault("browse_filters", None)
 
 # ---------- DATA ----------
+@profiled()  # outside the cache, so hits (and their copies) are timed too
 @st.cache_data
 def load_listings(csv_path: str) -> pd.DataFrame:
     """
     Loads listings.csv but ALSO guarantees required MVP columns exist:
     id,title,area,price,beds,landlord,verified_at,pending,photo_count
+
+    If a compiled catalog (see compile_catalog) sits next to the CSV and is newer than it and
+    the geocoder files (its lat/lon were looked up when it was compiled), it is memory-mapped
+    instead of parsing and re-normalizing the CSV.
     """
-    df = pd.read_csv(csv_path)
+    compiled = compiled_catalog_path(csv_path)
+    sources = [p for p in (csv_path, *geocoder_files()) if os.path.exists(p)]
+    if os.path.exists(compiled) and all(os.path.getmtime(compiled) >= os.path.getmtime(p) for p in sources):
+        out = read_compiled_catalog(compiled)
+        if out is not None:
+            return out
+    return normalize_listings(pd.read_csv(csv_path))
 
+
+def normalize_listings(df: pd.DataFrame) -> pd.DataFrame:
+    """Raw listings table (any of the known column aliases) -> the typed MVP schema."""
     # normalize columns
     df.columns = [c.strip() for c in df.columns]
     cols = {c.lower(): c for c in df.columns}
@@ -202,6 +360,13 @@ def load_listings(csv_path: str) -> pd.DataFrame:
 
     out["verified_at"] = out["verified_at"].fillna(pd.Timestamp.now().normalize() - pd.Timedelta(days=2))
 
+    # Card details the CSV may already carry -- listing_meta() uses these instead of seeded values
+    for c in ("address", "available_date", "lease_length"):
+        if get_col(c) is not None:
+            out[c] = df[get_col(c)].map(str, na_action="ignore")
+    if get_col("photo_count", "photos") is not None:
+        out["photo_count"] = df[get_col("photo_count", "photos")]
+
     # ✅ Funnel columns (guaranteed)
     if "pending" not in out.columns:
         out["pending"] = False
@@ -209,6 +374,7 @@ def load_listings(csv_path: str) -> pd.DataFrame:
         out["photo_count"] = 3  # seeded sample listings are “complete”
     if "lease_draft_uploaded" not in out.columns:
         out["lease_draft_uploaded"] = False
+    out["lat"], out["lon"] = geocode(out.get("address", pd.Series(None, index=out.index, dtype=object)), out["area"])
 
     # ensure types
     out["pending"] = out["pending"].astype(bool)
@@ -218,16 +384,425 @@ def load_listings(csv_path: str) -> pd.DataFrame:
     return out
 
 
+# ---------- COMPILED CATALOG (Arrow IPC) ----------
+def compiled_catalog_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".arrow"
+
+
+def compile_catalog(csv_path: str, out_path: str = None) -> str:
+    """
+    Normalize the CSV once and write it as an uncompressed Arrow IPC file, so loading is a
+    memory-map instead of text parsing + coercion. Returns the written path.
+    """
+    import pyarrow as pa
+
+    out_path = out_path or compiled_catalog_path(csv_path)
+    table = pa.Table.from_pandas(normalize_listings(pd.read_csv(csv_path)), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"catalog_schema_version"] = CATALOG_SCHEMA_VERSION.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = out_path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, out_path)  # readers never see a half-written file
+    return out_path
+
+
+def read_compiled_catalog(path: str):
+    """
+    Memory-map a compiled catalog. Returns None (so the caller falls back to the CSV) if pyarrow
+    is missing, the file is unreadable or truncated, or the schema version is stale.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+
+    try:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (pa.ArrowInvalid, OSError):
+        return None
+    metadata = table.schema.metadata or {}
+    if metadata.get(b"catalog_schema_version") != CATALOG_SCHEMA_VERSION.encode():
+        return None
+    return table.to_pandas()
+
+
+# ---------- SQLITE LISTINGS BACKEND (optional, LISTINGS_DB) ----------
+# Connections, schema and writes live in app/listings_db.py; these are the session-side reads.
+def listings_db():
+    """This thread's connection to LISTINGS_DB, or None when the SQLite backend is off."""
+    return db_connection(seed=lambda: load_listings(LISTINGS_CSV))
+
+
+def _db_listings(con) -> pd.DataFrame:
+    """
+    The whole table as a frame, re-read only when the database version moves. Only explicit
+    full-catalog reads (get_listings) land here; the page-level reads query just their rows.
+    """
+    version = listings_version()
+    hit = st.session_state.get("listings_db_frame")
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    df = _read_only(db_frame(pd.read_sql_query("SELECT * FROM listings ORDER BY id", con)))
+    st.session_state["listings_db_frame"] = (version, df)
+    return df
+
+
+def _db_visible_where(now: pd.Timestamp = None):
+    """The student funnel (see visible_mask) as a SQL condition + params."""
+    now = (now if now is not None else pd.Timestamp.now()).normalize()
+    cutoff = (now - pd.Timedelta(days=TRUST_UNVERIFIED_DAYS)).strftime("%Y-%m-%d")
+    return "pending = 0 AND photo_count >= 1 AND verified_at >= ?", [cutoff]
+
+
+def _db_select(con, where: str, params=(), order: str = "id") -> pd.DataFrame:
+    """SELECT * ... WHERE `where`, as a frame with load_listings()' columns and types."""
+    return db_frame(pd.read_sql_query(f"SELECT * FROM listings WHERE {where} ORDER BY {order}", con, params=list(params)))
+
+
+def _db_select_ids(con, columns: str, ids: list) -> pd.DataFrame:
+    """`columns` of the rows with these ids, in chunks under SQLite's bound-parameter limit."""
+    parts = [
+        pd.read_sql_query(
+            f"SELECT {columns} FROM listings WHERE id IN ({', '.join('?' * len(ids[i:i + 500]))})", con,
+            params=ids[i:i + 500],
+        )
+        for i in range(0, len(ids), 500)
+    ]
+    return pd.concat(parts, ignore_index=True) if parts else pd.read_sql_query(f"SELECT {columns} FROM listings LIMIT 0", con)
+
+
+# ---------- LISTINGS STORE ----------
+# Every session reads one process-wide base catalog (shared_catalog). A session only keeps its
+# own small overlay: appended rows, {column: {id: value}} edits, or a full replacement frame
+# after set_listings(). Reads merge base + overlay lazily, once per listings version.
+# Writers go through set_listings / update_listing / append_listings, which bump the version.
+# Readers get views, not copies: every frame the store keeps has read-only columns
+# (_read_only), so an in-place edit through a view raises instead of reaching other sessions.
+_LISTINGS_VERSIONS = itertools.count(1)
+
+
+@st.cache_resource
+def shared_catalog(csv_path: str) -> pd.DataFrame:
+    """
+    load_listings() once per process, shared by every session (cache_resource: no per-call copy),
+    with read-only columns.
+    """
+    return _read_only(load_listings(csv_path))
+
+
+def _read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    df with its numpy-backed columns marked read-only, without copying them. Assigning a whole
+    column to a view still works (the view gets a new array); writing into one raises.
+    """
+    cols = {}
+    for c in df.columns:
+        col = df[c]
+        if isinstance(col.dtype, np.dtype):
+            values = col.to_numpy().view()
+            values.flags.writeable = False
+            col = pd.Series(values, index=df.index, name=c, copy=False)
+        cols[c] = col
+    return pd.DataFrame(cols, index=df.index, copy=False)
+
+
+def _store_base() -> pd.DataFrame:
+    base = st.session_state.get("listings_override")
+    return shared_catalog(LISTINGS_CSV) if base is None else base
+
+
+def _listings_tail() -> tuple:
+    """
+    (row count, listings version, largest id) without building get_listings(). With
+    LISTINGS_DB one statement reads all three, so they describe the same table; in memory the
+    count is base + appended + still-buffered rows and the largest id is None -- new ids come
+    from the session's own counter (_next_listing_ids), which is always above every row.
+    """
+    con = listings_db()
+    if con is not None:
+        return con.execute(
+            "SELECT (SELECT COUNT(*) FROM listings), (SELECT version FROM listings_state),"
+            " (SELECT MAX(id) FROM listings)"
+        ).fetchone()
+    appended = st.session_state.get("listings_appended")
+    count = (len(_store_base()) + (0 if appended is None else len(appended))
+             + len(st.session_state.get("listings_append_buffer") or ()))
+    return count, listings_version(), None
+
+
+def _store_parts():
+    """
+    (base, appended, edits) of the session's listings: the shared catalog or set_listings()
+    frame, a small frame of appended rows (None if none) and the {column: {id: value}} edits.
+    Buffered appends are framed here, onto the small frame only -- the base is never copied.
+    """
+    base = _store_base()
+    appended = st.session_state.get("listings_appended")
+    added = st.session_state.get("listings_append_buffer")
+    if added:
+        new = pd.DataFrame(added)
+        appended = new if appended is None else pd.concat([appended, new], ignore_index=True)
+        st.session_state["listings_appended"] = appended
+        st.session_state["listings_append_buffer"] = []
+    return base, appended, st.session_state.get("listings_overlay") or {}
+
+
+def _listings_store() -> pd.DataFrame:
+    """
+    The session's current listings: the shared catalog (or the set_listings() frame) with this
+    session's appended rows and edits merged in. Untouched sessions get the shared frame itself;
+    the merged view is rebuilt once per listings version and never written back to the base.
+    """
+    con = listings_db()
+    if con is not None:
+        return _db_listings(con)
+
+    base, appended, edits = _store_parts()
+    if appended is None and not edits:
+        return base
+
+    version = listings_version()
+    hit = st.session_state.get("listings_merged")
+    if hit is not None and hit[0] == version:
+        return hit[1]
+
+    df = base.copy(deep=False) if appended is None else pd.concat([base, appended], ignore_index=True)
+    ids = pd.Index(df["id"])
+    for col, by_id in edits.items():
+        s = df[col].copy() if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+        s.iloc[ids.get_indexer(list(by_id))] = list(by_id.values())
+        df[col] = s  # replaces just this column; the others stay shared with the base
+    df = _read_only(df)
+    st.session_state["listings_merged"] = (version, df)
+    return df
+
+
+def _bump_listings_version():
+    st.session_state["listings_version"] = next(_LISTINGS_VERSIONS)
+
+
+@profiled()
 def get_listings() -> pd.DataFrame:
-    """Return listings dataframe, using in-session override if present."""
-    if st.session_state.get("listings_override") is not None:
-        return st.session_state["listings_override"].copy()
-    return load_listings("data/listings.csv")
+    """Return the session's listings as a view with read-only columns (no data is copied)."""
+    return _listings_store().copy(deep=False)
 
 
 def set_listings(df: pd.DataFrame):
-    """Persist listings changes for this demo session."""
-    st.session_state["listings_override"] = df.copy()
+    """Persist listings changes for this demo session (or for everyone, with LISTINGS_DB)."""
+    con = listings_db()
+    if con is not None:
+        with db_write(con):
+            con.execute("DELETE FROM listings")
+            db_insert(con, df)
+            con.execute("UPDATE listings_state SET next_id = MAX(next_id, (SELECT IFNULL(MAX(id), 0) + 1 FROM listings))")
+        return
+
+    st.session_state["listings_override"] = _read_only(df)
+    st.session_state["listings_appended"] = None
+    st.session_state["listings_append_buffer"] = []
+    st.session_state["listings_overlay"] = {}
+    st.session_state.pop("listings_merged", None)
+    st.session_state.pop("listings_next_id", None)  # re-derived from the new frame
+    _bump_listings_version()
+
+
+def listings_version() -> int:
+    """
+    Monotonic version of the session's listings (0 = untouched CSV).
+    Changes on set_listings / update_listing / append_listings, so it can key derived caches.
+    With LISTINGS_DB this is the database's version, so writes from other sessions count too.
+    """
+    con = listings_db()
+    if con is not None:
+        return con.execute("SELECT version FROM listings_state").fetchone()[0]
+    return st.session_state.get("listings_version", 0)
+
+
+def update_listing(listing_id: int, **values):
+    """Update columns of one listing (recorded in the session overlay; the base is never written)."""
+    update_listings([listing_id], **values)
+
+
+def update_listings(listing_ids, **values):
+    """
+    Set the same column values on many listings in one write (one version bump, however many
+    ids). Unknown ids are ignored.
+    """
+    listing_ids = list(listing_ids)
+    if not listing_ids:
+        return
+    con = listings_db()
+    if con is not None:
+        if "landlord" in values:
+            values = {**values, "landlord_key": landlord_key(values["landlord"])}
+        cols = [c for c in values if c in LISTINGS_DB_COLUMNS]  # the table has a fixed schema
+        if cols:
+            version_before = listings_version()
+            params = [db_value(values[c]) for c in cols]
+            with db_write(con):
+                con.executemany(
+                    f"UPDATE listings SET {', '.join(f'{c} = ?' for c in cols)} WHERE id = ?",
+                    [params + [int(i)] for i in listing_ids],
+                )
+            _keep_indexes_across_update(version_before, values)
+        return
+
+    index = listing_id_index()
+    ids = [i for i in map(int, listing_ids) if i in index]
+    if not ids:
+        return
+    edits = st.session_state.setdefault("listings_overlay", {})
+    for col, value in values.items():
+        edits.setdefault(col, {}).update(dict.fromkeys(ids, value))
+    version_before = listings_version()
+    _bump_listings_version()
+    _keep_indexes_across_update(version_before, values)
+
+
+def _keep_indexes_across_update(version_before: int, values: dict):
+    """An edit moves no rows, so position-keyed indexes carry over unchanged."""
+    advance_versioned_cache("listing_id_index", version_before, lambda index: index)
+    if "landlord" not in values:
+        advance_versioned_cache("landlord_index", version_before, lambda index: index)
+
+
+def append_listings(rows: list):
+    """
+    Append listing rows. They stay in the session overlay (a small frame of their own) and are
+    only concatenated onto the base in the next read's merged view, so many appends between
+    reads cost one concat instead of one each, and the base is never copied into the session.
+    """
+    if not rows:
+        return
+    con = listings_db()
+    if con is not None:
+        with db_write(con):
+            db_insert(con, pd.DataFrame(rows))
+        return
+
+    st.session_state.setdefault("listings_append_buffer", []).extend(rows)
+    _bump_listings_version()
+
+
+def _next_listing_ids(n: int) -> range:
+    """Reserve n new listing ids from a running counter (the max id is only scanned once)."""
+    con = listings_db()
+    if con is not None:
+        with db_write(con, bump=False):  # one transaction, so concurrent sessions never share ids
+            start = con.execute("SELECT next_id FROM listings_state").fetchone()[0]
+            con.execute("UPDATE listings_state SET next_id = ?", (start + n,))
+        return range(start, start + n)
+
+    start = st.session_state.get("listings_next_id")
+    if start is None:  # max over the parts, without merging them
+        appended = st.session_state.get("listings_appended")
+        ids = [_store_base()["id"].max(), -1 if appended is None else appended["id"].max()]
+        ids += [row["id"] for row in st.session_state.get("listings_append_buffer") or ()]
+        start = max(0, *(int(i) for i in ids if pd.notna(i))) + 1
+    st.session_state["listings_next_id"] = start + n
+    return range(start, start + n)
+
+
+_SHARED_DERIVED = {}  # versioned_cache() results for the untouched shared catalog: {key: (day, value)}
+_SHARED_DERIVED_LOCK = threading.Lock()
+
+
+def versioned_cache(key: str, build, day: str = None, source=None):
+    """
+    Per-session cache for anything derived from get_listings().
+    `build(df)` only re-runs when the listings version changes -- or, for values that also
+    depend on the date, when `day` changes. A new day replaces the entry, so every key holds
+    one value, however long the process runs. `source()` replaces get_listings() as build's
+    input when the value needs fewer rows or columns (e.g. a narrower query with LISTINGS_DB).
+    """
+    source = source or get_listings
+    version = listings_version()
+    if version == 0:  # untouched shared catalog: derive once per process, not once per session
+        with _SHARED_DERIVED_LOCK:
+            hit = _SHARED_DERIVED.get(key)
+            if hit is None or hit[0] != day:
+                hit = _SHARED_DERIVED[key] = (day, build(source()))
+            return hit[1]
+
+    hit = st.session_state.get(key)
+    if hit is not None and hit[0] == version and hit[2] == day:
+        return hit[1]
+    value = build(source())
+    st.session_state[key] = (version, value, day)
+    return value
+
+
+def _shared_derived(key: str):
+    """The process-wide versioned_cache() value for `key`, or None."""
+    hit = _SHARED_DERIVED.get(key)
+    return None if hit is None else hit[1]
+
+
+def advance_versioned_cache(key: str, from_version: int, update):
+    """
+    Carry a versioned_cache() entry across a write the caller knows how to apply: if `key`
+    was built at `from_version`, store update(value) for the current version instead of
+    letting the next read rebuild it. `update` must not mutate a value from _SHARED_DERIVED
+    (it is shared by every session); session-owned values may be updated in place.
+    """
+    if listings_db() is not None and listings_version() != from_version + 1:
+        return  # another session wrote in between; let the next read rebuild
+    if from_version == 0:
+        hit = _SHARED_DERIVED.get(key)
+        day, value = hit if hit is not None else (None, None)
+    else:
+        hit = st.session_state.get(key)
+        day, value = (hit[2], hit[1]) if hit is not None and hit[0] == from_version else (None, None)
+    if value is not None:
+        st.session_state[key] = (listings_version(), update(value), day)
+
+
+def build_listing_id_index(df: pd.DataFrame) -> dict:
+    """{listing id: row position in df}."""
+    return dict(zip(df["id"].tolist(), range(len(df))))
+
+
+def listing_id_index() -> dict:
+    """The id -> row position index of get_listings(), kept current by the store's writers."""
+    return versioned_cache("listing_id_index", build_listing_id_index)
+
+
+def get_listing(listing_id: int) -> pd.Series:
+    """
+    One listing by id (None if there is no such listing): a primary-key lookup with
+    LISTINGS_DB, otherwise O(1) via the id index and the store's parts.
+    """
+    con = listings_db()
+    if con is not None:
+        cur = con.execute("SELECT * FROM listings WHERE id = ?", (int(listing_id),))
+        found = cur.fetchone()
+        return None if found is None else db_row([d[0] for d in cur.description], found)
+    pos = listing_id_index().get(int(listing_id))
+    return None if pos is None else _store_row(pos, int(listing_id))
+
+
+def _store_row(pos: int, listing_id: int) -> pd.Series:
+    """
+    Row `pos` of _listings_store() read from the store's parts: the base (or appended) row
+    with only this listing's edits patched in, so a read after an edit never rebuilds the
+    merged view.
+    """
+    base, appended, edits = _store_parts()
+    row = base.iloc[pos] if pos < len(base) else appended.iloc[pos - len(base)]
+    if appended is not None:  # the columns, in order, of the merged view's concat
+        columns = base.columns.union(appended.columns, sort=False)
+        if not row.index.equals(columns):
+            row = row.reindex(columns)
+    if not edits:
+        return row
+    row = row.copy()
+    for col, by_id in edits.items():
+        row[col] = by_id.get(listing_id, row.get(col))  # a column only edits add is None elsewhere
+    return row
 
 
 def ensure_selected_listing(df: pd.DataFrame):
@@ -236,39 +811,190 @@ def ensure_selected_listing(df: pd.DataFrame):
 
 
 # ---------- LISTING META (fills “Unknown” fields) ----------
-def listing_meta(listing_id: int) -> dict:
-    """
-    Returns rich metadata for the listing card.
-    This is where we fill the “Unknown” fields without needing your CSV to change.
-    """
-    store = st.session_state.get("listing_meta", {})
-    if listing_id in store:
-        return store[listing_id]
+LISTING_META_FIELDS = ("address", "available_date", "lease_length", "photo_count", "area_detail")
+META_AREAS = ["Downtown", "Sandy Hill", "ByWard Market", "Glebe", "Vanier"]
+META_STREETS = ["Laurier Ave E", "Wilbrod St", "King Edward Ave", "Elgin St", "Rideau St"]
+_META_VECTOR_MIN = 16  # below this many ids the plain RandomState loop is faster
+_META_MAX_DRAWS = 64   # MT outputs precomputed per id; ids needing more fall back to RandomState
 
-    # seeded defaults (nice pitch-ready)
-    areas = ["Downtown", "Sandy Hill", "ByWard Market", "Glebe", "Vanier"]
-    streets = ["Laurier Ave E", "Wilbrod St", "King Edward Ave", "Elgin St", "Rideau St"]
-    rng = np.random.RandomState(listing_id * 17)
 
-    meta = {
-        "address": f"{rng.randint(40, 420)} {rng.choice(streets)}",
+def _seeded_meta(listing_id: int) -> dict:
+    """Seeded defaults (nice pitch-ready) for one listing."""
+    rng = np.random.RandomState(listing_id * 17)
+    return {
+        "address": f"{rng.randint(40, 420)} {rng.choice(META_STREETS)}",
         "available_date": str((date.today() + timedelta(days=21)).isoformat()),
         "lease_length": f"{rng.choice([8, 12])} months",
         "photo_count": int(rng.choice([1, 2, 3])),
-        "area_detail": rng.choice(areas),
+        "area_detail": rng.choice(META_AREAS),
+    }
+
+
+def _mt19937_first_outputs(seeds: np.ndarray, k: int) -> np.ndarray:
+    """
+    First k 32-bit outputs of np.random.RandomState(seed) for every seed at once (one row each):
+    MT19937 init_genrand, the first twist (only the k words we need) and tempering.
+    """
+    n = len(seeds)
+    lo = np.empty((n, k + 1), np.uint64)  # state words 0..k
+    hi = np.empty((n, k), np.uint64)      # state words 397..397+k-1
+    x = seeds.astype(np.uint64) & 0xFFFFFFFF
+    for i in range(397 + k):
+        if i <= k:
+            lo[:, i] = x
+        if i >= 397:
+            hi[:, i - 397] = x
+        x = (1812433253 * (x ^ (x >> 30)) + (i + 1)) & 0xFFFFFFFF
+
+    y = (lo[:, :k] & 0x80000000) | (lo[:, 1:] & 0x7FFFFFFF)
+    out = hi ^ (y >> 1) ^ (np.uint64(0x9908B0DF) * (y & 1))
+    out ^= out >> 11
+    out ^= (out << 7) & 0x9D2C5680
+    out ^= (out << 15) & 0xEFC60000
+    out ^= out >> 18
+    return out
+
+
+def seeded_listing_meta(ids) -> pd.DataFrame:
+    """
+    _seeded_meta() for many ids in one vectorized step -- the exact same values, one row per id.
+    Reproduces RandomState's draws directly: randint/choice are masked rejection sampling on
+    the MT19937 output stream, so each id just walks its own row of precomputed outputs.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    if len(ids) < _META_VECTOR_MIN or ids.min() < 0 or ids.max() * 17 > 0xFFFFFFFF:
+        return pd.DataFrame([_seeded_meta(int(i)) for i in ids], index=ids, columns=list(LISTING_META_FIELDS), dtype=object)
+
+    k = _META_MAX_DRAWS
+    draws = _mt19937_first_outputs(ids * 17, k)
+    rows = np.arange(len(ids))
+    cursor = np.zeros(len(ids), dtype=np.int64)
+
+    def bounded(rng: int, mask: int) -> np.ndarray:
+        """RandomState.randint(0, rng + 1) for every row: redraw while (output & mask) > rng."""
+        nonlocal cursor
+        val = draws[rows, np.minimum(cursor, k - 1)] & mask
+        reject = val > rng
+        while reject.any():
+            cursor = cursor + reject
+            val = np.where(reject, draws[rows, np.minimum(cursor, k - 1)] & mask, val)
+            reject = (val > rng) & (cursor < k)
+        cursor = cursor + 1
+        return val.astype(np.int64)
+
+    number = 40 + bounded(379, 511)  # randint(40, 420)
+    street = bounded(4, 7)           # choice(streets)
+    lease = bounded(1, 1)            # choice([8, 12])
+    photos = bounded(2, 3)           # choice([1, 2, 3])
+    area = bounded(4, 7)             # choice(areas)
+
+    out = pd.DataFrame({
+        "address": pd.Series(number).astype(str).to_numpy(dtype=object) + " " + np.asarray(META_STREETS, dtype=object)[street],
+        "available_date": str((date.today() + timedelta(days=21)).isoformat()),
+        "lease_length": np.asarray(["8 months", "12 months"], dtype=object)[lease],
+        "photo_count": np.asarray([1, 2, 3], dtype=object)[photos],
+        "area_detail": np.asarray(META_AREAS, dtype=object)[area],
+    }, index=ids, dtype=object)
+
+    overflow = cursor > k  # astronomically rare: ran past the precomputed outputs
+    for i in ids[overflow]:
+        out.loc[i] = pd.Series(_seeded_meta(int(i)))
+    return out
+
+
+def _catalog_meta(df: pd.DataFrame) -> pd.DataFrame:
+    """Meta fields the listings frame already has (CSV columns, or the pending-listing rows)."""
+    cols = [c for c in ("address", "available_date", "lease_length", "photo_count") if c in df.columns]
+    meta = df[["id", "area"] + cols].drop_duplicates("id", keep="last").set_index("id")
+    return meta.rename(columns={"area": "area_detail"}).astype(object)
+
+
+def _listing_catalog_meta(ids: pd.Index) -> pd.DataFrame:
+    """_catalog_meta() covering `ids`: the catalog-wide cached table, or just those rows with LISTINGS_DB."""
+    con = listings_db()
+    if con is None:
+        return versioned_cache("listing_meta_catalog", _catalog_meta)
+    rows = _db_select_ids(con, "id, area, address, available_date, lease_length, photo_count", ids.tolist())
+    rows["photo_count"] = rows["photo_count"].fillna(0).astype(int)  # as db_frame() reads it
+    return _catalog_meta(rows)
+
+
+def listing_meta_table(ids) -> pd.DataFrame:
+    """
+    Card metadata for many listings at once: one row per id (in order), LISTING_META_FIELDS then
+    any extra keys saved with set_listing_meta(). Each value comes from set_listing_meta(), else
+    the listings' own columns, else the seeded defaults -- generated only for ids still missing one.
+    """
+    ids = np.asarray(ids, dtype=np.int64).ravel()
+    uniq = pd.Index(pd.unique(ids))
+
+    out = pd.DataFrame(index=uniq, columns=list(LISTING_META_FIELDS), dtype=object)
+    explicit = st.session_state.get("listing_meta")
+    if explicit is not None and len(explicit):
+        out = out.combine_first(explicit.reindex(uniq))
+    out = out.combine_first(_listing_catalog_meta(uniq).reindex(uniq))
+
+    missing = out[list(LISTING_META_FIELDS)].isna().any(axis=1).to_numpy()
+    if missing.any():
+        out = out.combine_first(seeded_listing_meta(uniq[missing]))
+
+    extras = [c for c in out.columns if c not in LISTING_META_FIELDS]
+    return out.reindex(index=ids, columns=list(LISTING_META_FIELDS) + extras)
+
+
+@profiled()
+def listing_metas(ids) -> dict:
+    """listing_meta() for many listings in one batch: {listing_id: meta dict}."""
+    table = listing_meta_table(ids)
+    return {
+        int(i): {k: v for k, v in row.items() if not (v is None or (isinstance(v, float) and np.isnan(v)))}
+        for i, row in zip(table.index, table.to_dict("records"))
     }
 
-    store[listing_id] = meta
-    st.session_state["listing_meta"] = store
-    return meta
+
+def _meta_missing(v) -> bool:
+    return v is None or (pd.api.types.is_scalar(v) and pd.isna(v))
+
+
+@profiled()
+def listing_meta(listing_id: int) -> dict:
+    """
+    Returns rich metadata for the listing card.
+    This is where we fill the “Unknown” fields without needing your CSV to change.
+    Same values as listing_metas([listing_id]), without the batch's frame work: the
+    set_listing_meta() row, else the listing's own row (get_listing), else _seeded_meta().
+    """
+    listing_id = int(listing_id)
+    meta = {}
+    explicit = st.session_state.get("listing_meta")
+    if explicit is not None and listing_id in explicit.index:
+        meta = {k: v for k, v in explicit.loc[listing_id].items() if not _meta_missing(v)}
+
+    if any(f not in meta for f in LISTING_META_FIELDS):
+        row = get_listing(listing_id)
+        if row is not None:
+            own = {"area_detail": row["area"], **{c: row[c] for c in ("address", "available_date", "lease_length", "photo_count") if c in row.index}}
+            meta.update({f: v for f, v in own.items() if f not in meta and not _meta_missing(v)})
+    if any(f not in meta for f in LISTING_META_FIELDS):
+        meta.update({f: v for f, v in _seeded_meta(listing_id).items() if f not in meta})
+
+    extras = [k for k in meta if k not in LISTING_META_FIELDS]
+    return {k: meta[k] for k in list(LISTING_META_FIELDS) + extras}
 
 
 def set_listing_meta(listing_id: int, meta_updates: dict):
-    store = st.session_state.get("listing_meta", {})
-    base = store.get(listing_id, listing_meta(listing_id))
-    base.update(meta_updates or {})
-    store[listing_id] = base
-    st.session_state["listing_meta"] = store
+    set_listing_meta_many({listing_id: meta_updates})
+
+
+def set_listing_meta_many(updates: dict):
+    """set_listing_meta() for many listings at once: {listing_id: meta_updates}."""
+    if not updates:
+        return
+    new = pd.DataFrame.from_dict(
+        {int(k): (v or {}) for k, v in updates.items()}, orient="index", dtype=object
+    )
+    store = st.session_state.get("listing_meta")
+    st.session_state["listing_meta"] = new.combine_first(store) if store is not None and len(store) else new
 
 
 # ---------- TRUST / BADGES ----------
@@ -285,6 +1011,154 @@ def trust_status(ts: pd.Timestamp):
     return "Unverified", "r"
 
 
+def days_since_array(verified_at, now: pd.Timestamp = None) -> np.ndarray:
+    """
+    Columnar days_since(): whole days from each timestamp to `now` (one "now" for the
+    whole column). Missing / unparseable timestamps come back as NaN.
+    """
+    now = (now if now is not None else pd.Timestamp.now()).normalize()
+    ts = pd.to_datetime(pd.Series(verified_at), errors="coerce").to_numpy("datetime64[ns]")
+    return (np.datetime64(now, "D") - ts.astype("datetime64[D]")) / np.timedelta64(1, "D")
+
+
+def trust_status_array(verified_at, now: pd.Timestamp = None) -> np.ndarray:
+    """Columnar trust_status(): Verified / Stale / Unverified per row (missing = Unverified)."""
+    d = days_since_array(verified_at, now)
+    return np.select(
+        [d <= TRUST_STALE_DAYS, d <= TRUST_UNVERIFIED_DAYS],
+        ["Verified", "Stale"],
+        default="Unverified",
+    )
+
+
+# ---------- TRUST DECAY SCHEDULE ----------
+# A listing's status only changes on two known days: the day it turns Stale and the day it turns
+# Unverified. The schedule stores both per row plus a min-heap of each row's next transition, so
+# moving "today" forward only touches rows whose transition has actually passed.
+TRUST_SOON_DAYS = 2  # "about to go stale" horizon for reconfirmation reminders
+
+
+def _day_number(ts) -> int:
+    """Timestamp -> whole days since the epoch (what the schedule is keyed on)."""
+    return int(np.datetime64(pd.Timestamp(ts).normalize(), "D").astype(np.int64))
+
+
+def build_trust_schedule(df: pd.DataFrame) -> dict:
+    """
+    Trust schedule for the rows of df (row positions are df positions):
+      stale_at / unverified_at -- first day (epoch days) the row is Stale / Unverified
+      status                   -- current status per row, as of `day`
+      heap                     -- (day, row) of every row's next transition
+    Missing verified_at = Unverified from the start, never scheduled.
+    """
+    verified = pd.to_datetime(df["verified_at"], errors="coerce").to_numpy("datetime64[D]")
+    never = np.iinfo(np.int64).min
+    days = np.where(np.isnat(verified), never, verified.astype(np.int64))
+    return {
+        "stale_at": np.where(days == never, never, days + TRUST_STALE_DAYS + 1),
+        "unverified_at": np.where(days == never, never, days + TRUST_UNVERIFIED_DAYS + 1),
+        "status": None,
+        "heap": [],
+        "day": None,
+        "lock": threading.Lock(),  # shared across sessions while the catalog is untouched
+    }
+
+
+def advance_trust_schedule(sched: dict, now: pd.Timestamp = None):
+    """Bring statuses up to `now`'s day: pop and apply only the transitions that are now due."""
+    day = _day_number(now if now is not None else pd.Timestamp.now())
+    with sched["lock"]:
+        if sched["day"] is not None and day == sched["day"]:
+            return
+        stale_at, unverified_at = sched["stale_at"], sched["unverified_at"]
+
+        if sched["day"] is None or day < sched["day"]:  # first use (or the clock went back)
+            status = np.select([day < stale_at, day < unverified_at], ["Verified", "Stale"], default="Unverified")
+            nxt = np.where(day < stale_at, stale_at, unverified_at)
+            rows = np.flatnonzero(status != "Unverified")
+            heap = list(zip(nxt[rows].tolist(), rows.tolist()))
+            heapq.heapify(heap)
+            sched["status"], sched["heap"] = status, heap
+        else:
+            status, heap = sched["status"], sched["heap"]
+            while heap and heap[0][0] <= day:
+                _, row = heapq.heappop(heap)
+                if day < unverified_at[row]:
+                    status[row] = "Stale"
+                    heapq.heappush(heap, (int(unverified_at[row]), row))
+                else:
+                    status[row] = "Unverified"
+        sched["day"] = day
+
+
+def trust_schedule(now: pd.Timestamp = None) -> dict:
+    """The listings' trust schedule (rebuilt per listings version), advanced to `now`."""
+    sched = versioned_cache("trust_schedule", build_trust_schedule)
+    advance_trust_schedule(sched, now)
+    return sched
+
+
+def _heap_items_until(heap: list, limit) -> list:
+    """Heap entries with key <= limit, visiting only those entries (and their direct children)."""
+    out, todo = [], [0] if heap else []
+    while todo:
+        i = todo.pop()
+        if heap[i][0] <= limit:
+            out.append(heap[i])
+            todo.extend(c for c in (2 * i + 1, 2 * i + 2) if c < len(heap))
+    return out
+
+
+def schedule_rows_due(sched: dict, within_days: int = TRUST_SOON_DAYS) -> np.ndarray:
+    """
+    Rows of an advanced schedule that need reconfirming: Verified rows whose Stale day falls
+    within `within_days` (from the heap, soonest first), then rows already Stale or Unverified
+    that were verified at least once (from the status array).
+    """
+    with sched["lock"]:
+        due = _heap_items_until(sched["heap"], sched["day"] + within_days)
+        soon = [row for _, row in sorted(due) if sched["status"][row] == "Verified"]
+        past = np.flatnonzero((sched["status"] != "Verified") & (sched["stale_at"] != np.iinfo(np.int64).min))
+    return np.concatenate([np.asarray(soon, dtype=np.intp), past])
+
+
+def listings_going_stale(within_days: int = TRUST_SOON_DAYS, now: pd.Timestamp = None, landlord: str = None) -> pd.DataFrame:
+    """
+    Verified listings that turn Stale within `within_days` days, soonest first, with a
+    `stale_at` column -- for batch reconfirmation reminders. Reads only the heap entries due
+    by then instead of scanning the catalog (with LISTINGS_DB, a verified_at range query).
+    `landlord` narrows it to one landlord's listings.
+    """
+    con = listings_db()
+    if con is not None:
+        return _db_going_stale(con, within_days, now, landlord)
+    sched = trust_schedule(now)
+    with sched["lock"]:
+        due = _heap_items_until(sched["heap"], sched["day"] + within_days)
+        rows = [row for _, row in sorted(due) if sched["status"][row] == "Verified"]
+
+    out = get_listings().iloc[rows]
+    out["stale_at"] = pd.to_datetime(sched["stale_at"][rows], unit="D")
+    if landlord is not None:
+        out = out[out["landlord"].map(landlord_key) == landlord_key(landlord)]
+    return out
+
+
+def _db_going_stale(con, within_days: int, now: pd.Timestamp, landlord: str) -> pd.DataFrame:
+    """listings_going_stale() as SQL: still Verified and stale_at <= today + within_days."""
+    today = (now if now is not None else pd.Timestamp.now()).normalize()
+    # stale_at = verified day + TRUST_STALE_DAYS + 1, so this is a half-open verified_at day range
+    lo = today - pd.Timedelta(days=TRUST_STALE_DAYS)
+    hi = today + pd.Timedelta(days=within_days - TRUST_STALE_DAYS)
+    where, params = "verified_at >= ? AND verified_at < ?", [f"{lo:%Y-%m-%d}", f"{hi:%Y-%m-%d}"]
+    if landlord is not None:
+        where += " AND landlord_key = ?"
+        params.append(landlord_key(landlord))
+    out = _db_select(con, where, params, order="substr(verified_at, 1, 10), id")
+    out["stale_at"] = out["verified_at"].dt.normalize() + pd.Timedelta(days=TRUST_STALE_DAYS + 1)
+    return out
+
+
 def trust_badge(ts: pd.Timestamp):
     status, cls = trust_status(ts)
     d = days_since(ts)
@@ -296,16 +1170,42 @@ def pending_badge():
     return '<span class="badge p">Pending verification</span>'
 
 
+PRICE_BAND_FALLBACK = (800, 950)
+
+
+@profiled()
 def compute_price_band(df: pd.DataFrame, area: str):
     area_df = df[df["area"] == area]
     if len(area_df) < 3:
-        return 800, 950
+        return PRICE_BAND_FALLBACK
     lo = int(np.percentile(area_df["price"], 25))
     hi = int(np.percentile(area_df["price"], 75))
     return lo, hi
 
 
+def build_price_band_index(df: pd.DataFrame) -> dict:
+    """
+    {area: (p25, p75)} for every area in one groupby -- same numbers as compute_price_band().
+    Areas with fewer than 3 listings are left out and fall back to PRICE_BAND_FALLBACK.
+    """
+    if df.empty:
+        return {}
+    prices = df.groupby("area", sort=False)["price"]
+    counts = prices.size()
+    q = prices.quantile([0.25, 0.75]).unstack()[counts >= 3]
+    return {area: (int(lo), int(hi)) for area, lo, hi in zip(q.index, q[0.25], q[0.75])}
+
+
+@profiled()
+def price_band(area: str):
+    """O(1) price band lookup, backed by an index rebuilt once per listings version."""
+    con = listings_db()
+    source = None if con is None else (lambda: pd.read_sql_query("SELECT area, price FROM listings", con))
+    return versioned_cache("price_band_index", build_price_band_index, source=source).get(area, PRICE_BAND_FALLBACK)
+
+
 # ---------- FUNNEL VISIBILITY ----------
+@profiled()
 def is_visible_to_students(row: pd.Series) -> bool:
     """
     This is the core of your “verification funnel”.
@@ -335,6 +1235,38 @@ def is_visible_to_students(row: pd.Series) -> bool:
         return False
 
 
+@profiled()
+def visible_mask(df: pd.DataFrame, now: pd.Timestamp = None) -> np.ndarray:
+    """
+    Same funnel as is_visible_to_students(), for the whole frame in one pass.
+    Returns a boolean NumPy mask aligned with df's rows.
+    """
+    n = len(df)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    pending = df["pending"].to_numpy(dtype=bool) if "pending" in df.columns else np.zeros(n, dtype=bool)
+    if "photo_count" in df.columns:
+        photos = pd.to_numeric(df["photo_count"], errors="coerce").to_numpy(dtype=float)
+    else:
+        photos = np.zeros(n)
+    if "verified_at" in df.columns:
+        days = days_since_array(df["verified_at"], now)
+    else:
+        days = np.full(n, np.nan)
+
+    # NaN days / photos compare False -> hidden, like the row-wise try/except
+    return ~pending & (days <= TRUST_UNVERIFIED_DAYS) & (photos >= 1)
+
+
+def visible_listings(df: pd.DataFrame, now: pd.Timestamp = None) -> pd.DataFrame:
+    """Funnel-visible rows of df, with a `trust_status` column computed from the same "now"."""
+    now = now if now is not None else pd.Timestamp.now()
+    out = df[visible_mask(df, now)].copy()
+    out["trust_status"] = trust_status_array(out["verified_at"], now)
+    return out
+
+
 def can_landlord_make_visible() -> bool:
     """
     Landlord must:
@@ -351,12 +1283,207 @@ def mark_verified(listing_id: int):
     Call this after landlord confirms availability.
     Sets: pending=False, verified_at=now
     """
-    df = get_listings()
-    if df.empty:
-        return
-    df.loc[df["id"] == int(listing_id), "pending"] = False
-    df.loc[df["id"] == int(listing_id), "verified_at"] = pd.Timestamp.now().normalize()
-    set_listings(df)
+    mark_verified_many([listing_id])
+
+
+def mark_verified_many(listing_ids):
+    """mark_verified() for a whole set of listings, as one write."""
+    update_listings(listing_ids, pending=False, verified_at=pd.Timestamp.now().normalize())
+
+
+def confirm_availability(listing_ids) -> dict:
+    """
+    Landlord "Confirm availability" for any number of listings. The funnel prerequisites are
+    checked once: the landlord profile (can_landlord_make_visible) for the whole batch, photos
+    per listing. Listings that pass are marked verified together.
+    Returns {"profile_ok", "confirmed", "missing_photos", "not_found"} (lists of ids).
+    """
+    result = {"profile_ok": can_landlord_make_visible(), "confirmed": [], "missing_photos": [], "not_found": []}
+    if not result["profile_ok"]:
+        return result
+
+    ids = list(dict.fromkeys(map(int, listing_ids)))
+    con = listings_db()
+    if con is not None:
+        # only the requested rows' photo counts, not the whole table
+        photo_counts = {}
+        for start in range(0, len(ids), 500):  # stay under SQLite's bound-parameter limit
+            chunk = ids[start:start + 500]
+            photo_counts.update(con.execute(
+                f"SELECT id, photo_count FROM listings WHERE id IN ({', '.join('?' * len(chunk))})", chunk,
+            ).fetchall())
+        found = [i for i in ids if i in photo_counts]
+        photos = pd.to_numeric(pd.Series([photo_counts[i] for i in found], dtype=object), errors="coerce").to_numpy()
+    else:
+        index = listing_id_index()
+        found = [i for i in ids if i in index]
+        photos = pd.to_numeric(_listings_store()["photo_count"].iloc[[index[i] for i in found]], errors="coerce").to_numpy()
+    found_set = set(found)
+    result["not_found"] = [i for i in ids if i not in found_set]
+
+    ok = photos >= 1  # NaN -> no photos
+    result["confirmed"] = [i for i, good in zip(found, ok) if good]
+    result["missing_photos"] = [i for i, good in zip(found, ok) if not good]
+    mark_verified_many(result["confirmed"])
+    return result
+
+
+# ---------- BROWSE FILTER INDEX ----------
+BED_BUCKETS = ("Studio (0)", "1", "2", "3+")
+BROWSE_PAGE_SIZES = (10, 25, 50)
+
+
+def build_listing_filter_index(df: pd.DataFrame, now: pd.Timestamp = None) -> dict:
+    """
+    Filter index over the funnel-visible listings, for Browse:
+      rows    -- visible_listings() sorted by price (stable), so any subset stays price-sorted
+      prices  -- their prices ascending, for searchsorted "price <= max" cuts
+      areas   -- {area: bool bitmap over rows}
+      beds    -- {bucket in BED_BUCKETS: bool bitmap over rows}
+      commute -- minutes to campus per row (NaN = unknown area), also the rows' commute_min
+      spatial -- build_spatial_index() over the rows' lat/lon
+    """
+    rows = visible_listings(df, now).sort_values("price", kind="stable").reset_index(drop=True)
+    rows["commute_min"] = commute_minutes(rows["area"])
+    rows["lat"], rows["lon"] = listing_coordinates(rows)
+    prices = pd.to_numeric(rows["price"], errors="coerce").to_numpy(dtype=float)
+    beds = pd.to_numeric(rows["beds"], errors="coerce").to_numpy(dtype=float)
+
+    codes, uniques = pd.factorize(rows["area"])
+    areas = {a: codes == i for i, a in enumerate(uniques)}
+    buckets = {
+        "Studio (0)": beds == 0,
+        "1": beds == 1,
+        "2": beds == 2,
+        "3+": beds >= 3,
+    }
+    return {
+        "rows": rows, "prices": prices, "areas": areas, "beds": buckets,
+        "commute": rows["commute_min"].to_numpy(), "spatial": build_spatial_index(rows["lat"], rows["lon"]),
+    }
+
+
+def listing_filter_index(now: pd.Timestamp = None) -> dict:
+    """build_listing_filter_index() for the current listings, rebuilt per listings version and day."""
+    now = now if now is not None else pd.Timestamp.now()
+    # visibility decays by whole days, so the day is part of the key
+    con = listings_db()
+    source = None if con is None else (lambda: _db_select(con, *_db_visible_where(now)))  # only rows it can hold
+    return versioned_cache(
+        "listing_filter_index", lambda df: build_listing_filter_index(df, now), day=f"{now:%Y-%m-%d}", source=source,
+    )
+
+
+def filter_listings(
+    index: dict, max_price=None, area: str = None, beds: str = None, max_commute=None, near=None,
+) -> pd.DataFrame:
+    """
+    Visible listings with price <= max_price, in `area`, in bed bucket `beds`, at most
+    `max_commute` minutes from campus and, with near=(lat, lon, km), within km of that point
+    (None / "All" / "Any" = no filter), already sorted by price. Listings in areas without a
+    known commute are kept; listings without coordinates never match `near`.
+    """
+    n = len(index["rows"])
+    hi = n if max_price is None else int(np.searchsorted(index["prices"], max_price, side="right"))
+
+    mask = None
+    if area not in (None, "All"):
+        mask = index["areas"].get(area, np.zeros(n, dtype=bool))[:hi]
+    if beds not in (None, "Any"):
+        bucket = index["beds"][beds][:hi]
+        mask = bucket if mask is None else mask & bucket
+    if max_commute is not None:
+        short = ~(index["commute"][:hi] > max_commute)  # NaN (unknown) stays in
+        mask = short if mask is None else mask & short
+    if near is not None:
+        close = np.zeros(hi, dtype=bool)
+        hits = spatial_within(index["spatial"], *near)
+        close[hits[hits < hi]] = True
+        mask = close if mask is None else mask & close
+
+    positions = np.arange(hi) if mask is None else np.flatnonzero(mask)
+    return index["rows"].iloc[positions]
+
+
+_BED_BUCKET_SQL = {"Studio (0)": "beds = 0", "1": "beds = 1", "2": "beds = 2", "3+": "beds >= 3"}
+
+
+@profiled()
+def query_listings(
+    max_price=None, area: str = None, beds: str = None, max_commute=None, near=None, now: pd.Timestamp = None,
+) -> pd.DataFrame:
+    """
+    Browse query: visible listings matching the filters (see filter_listings), sorted by price,
+    with `trust_status` and `commute_min`. Runs as one SQL query with LISTINGS_DB, otherwise
+    against listing_filter_index().
+    """
+    con = listings_db()
+    if con is None:
+        return filter_listings(
+            listing_filter_index(now), max_price=max_price, area=area, beds=beds, max_commute=max_commute, near=near,
+        )
+
+    where, params = _db_visible_where(now)
+    if max_price is not None:
+        where += " AND price <= ?"
+        params.append(int(max_price))
+    if area not in (None, "All"):
+        where += " AND area = ?"
+        params.append(area)
+    if beds not in (None, "Any"):
+        where += f" AND {_BED_BUCKET_SQL[beds]}"
+    if near is not None:  # bounding box on the lat index; the exact radius is checked below
+        lat, lon, km = near
+        dlat = km / KM_PER_DEG_LAT
+        dlon = km / (KM_PER_DEG_LON_EQUATOR * np.cos(np.radians(lat)))
+        where += " AND lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?"
+        params += [lat - dlat, lat + dlat, lon - dlon, lon + dlon]
+    rows = db_frame(pd.read_sql_query(f"SELECT * FROM listings WHERE {where} ORDER BY price, id", con, params=params))
+    rows["trust_status"] = trust_status_array(rows["verified_at"], now)
+    rows["commute_min"] = commute_minutes(rows["area"])
+    if max_commute is not None:
+        rows = rows[~(rows["commute_min"].to_numpy() > max_commute)]
+    if near is not None:
+        rows = rows[distance_km(*listing_coordinates(rows), near[0], near[1], lat0=near[0]) <= near[2]]
+    return rows.reset_index(drop=True)
+
+
+def listing_areas(now: pd.Timestamp = None) -> list:
+    """Sorted areas that have at least one visible listing (empty = nothing to browse)."""
+    con = listings_db()
+    if con is None:
+        return sorted(listing_filter_index(now)["areas"])
+    where, params = _db_visible_where(now)
+    return [a for (a,) in con.execute(f"SELECT DISTINCT area FROM listings WHERE {where} ORDER BY area", params)]
+
+
+def results_window(total: int, page: int, page_size: int):
+    """Clamp a results cursor: returns (start, stop, page, n_pages) for rows[start:stop]."""
+    n_pages = max(1, -(-total // page_size))
+    page = min(max(int(page), 0), n_pages - 1)
+    start = page * page_size
+    return start, min(start + page_size, total), page, n_pages
+
+
+# ---------- LANDLORD INDEX ----------
+# landlord_key() (how names are matched) lives in app/listings_db.py, which stores it per row.
+def build_landlord_index(df: pd.DataFrame) -> dict:
+    """{landlord_key: row positions in df, ordered by listing id} -- names normalized once."""
+    order = np.argsort(df["id"].to_numpy(), kind="stable")
+    keys = df["landlord"].astype(str).str.strip().str.lower().to_numpy()[order]
+    return {k: order[pos] for k, pos in pd.Series(keys).groupby(keys).indices.items()}
+
+
+def landlord_listings(name: str) -> pd.DataFrame:
+    """
+    Listings owned by `name`, ordered by id, in O(own listings): via the landlord index, or
+    an indexed landlord_key lookup with LISTINGS_DB.
+    """
+    con = listings_db()
+    if con is not None:
+        return _db_select(con, "landlord_key = ?", [landlord_key(name)])
+    index = versioned_cache("landlord_index", build_landlord_index)
+    return get_listings().iloc[index.get(landlord_key(name), np.empty(0, dtype=np.int64))]
 
 
 # ---------- CREATE LISTING (Request to List form) ----------
@@ -376,57 +1503,301 @@ def create_pending_listing(
     Creates a listing in 🟡 Pending verification state.
     It will NOT appear to students until mark_verified() is called.
     """
-    df = get_listings()
-
-    new_id = int(df["id"].max() + 1) if not df.empty else 1
-
-    row = {
-        "id": new_id,
-        "title": title or f"Unit {new_id}",
-        "area": area or "Unknown",
-        "price": int(price) if price is not None else 999,
-        "beds": int(beds) if beds is not None else 1,
-        "landlord": landlord_name or "Private Landlord",
-        "verified_at": pd.NaT,          # not verified yet
-        "pending": True,               # ✅ funnel flag
-        "photo_count": int(photo_count),
-        "lease_draft_uploaded": bool(lease_draft_uploaded),
-    }
+    return create_pending_listings([{
+        "landlord_name": landlord_name,
+        "title": title,
+        "area": area,
+        "price": price,
+        "beds": beds,
+        "address": address,
+        "available_date": available_date,
+        "lease_length": lease_length,
+        "photo_count": photo_count,
+        "lease_draft_uploaded": lease_draft_uploaded,
+    }])[0]
+
+
+def create_pending_listings(listings: list) -> list:
+    """
+    Bulk version of create_pending_listing() for landlords onboarding a whole portfolio.
+    `listings` is a list of dicts with create_pending_listing()'s argument names; missing
+    keys get the same defaults. Returns the new ids, in input order.
+    """
+    listings = list(listings)
+    new_ids = _next_listing_ids(len(listings))
+    rows = []
+
+    for new_id, l in zip(new_ids, listings):
+        area = l.get("area")
+        price = l.get("price")
+        beds = l.get("beds")
+        photo_count = int(l.get("photo_count") or 0)
+
+        rows.append({
+            "id": new_id,
+            "title": l.get("title") or f"Unit {new_id}",
+            "area": area or "Unknown",
+            "price": int(price) if price is not None else 999,
+            "beds": int(beds) if beds is not None else 1,
+            "landlord": l.get("landlord_name") or "Private Landlord",
+            "verified_at": pd.NaT,          # not verified yet
+            "pending": True,               # ✅ funnel flag
+            "photo_count": photo_count,
+            "lease_draft_uploaded": bool(l.get("lease_draft_uploaded")),
+            # card details live on the row, so listing_meta() (and other sessions) see them
+            "address": l.get("address") or "Unknown",
+            "available_date": l.get("available_date") or str((date.today() + timedelta(days=30)).isoformat()),
+            "lease_length": l.get("lease_length") or "12 months",
+        })
+
+    lat, lon = geocode([r["address"] for r in rows], [r["area"] for r in rows])
+    for row, a, b in zip(rows, lat, lon):
+        row["lat"], row["lon"] = float(a), float(b)
+
+    # new rows land at the end of the frame with the highest ids, so the landlord and id
+    # indexes can be extended in place of a rebuild
+    n_before, version_before, max_before = _listings_tail()
+    append_listings(rows)
+    if max_before is not None and new_ids.start <= max_before:
+        # another session inserted higher ids after ours were reserved, so the new rows sort
+        # before theirs: positions shift and the indexes are left to rebuild
+        return list(new_ids)
+
+    def add_ids(index):
+        if index is _shared_derived("listing_id_index"):
+            index = dict(index)  # the process-wide one; copy once, then this session owns it
+        index.update(zip((row["id"] for row in rows), range(n_before, n_before + len(rows))))
+        return index
+
+    def add_rows(index):
+        index = dict(index)
+        for pos, row in enumerate(rows, start=n_before):
+            key = landlord_key(row["landlord"])
+            index[key] = np.append(index.get(key, np.empty(0, dtype=np.int64)), pos)
+        return index
+
+    advance_versioned_cache("landlord_index", version_before, add_rows)
+    advance_versioned_cache("listing_id_index", version_before, add_ids)
+    return list(new_ids)
 
-    df2 = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    set_listings(df2)
 
-    # store nice metadata for cards
-    set_listing_meta(new_id, {
-        "address": address or "Unknown",
-        "available_date": available_date or str((date.today() + timedelta(days=30)).isoformat()),
-        "lease_length": lease_length or "12 months",
-        "photo_count": int(photo_count),
-        "area_detail": area or "Unknown",
-    })
+# ---------- RISK / LEASE SCAN ----------
+def _regex_branches(pattern: str, i: int = 0):
+    """
+    Just enough of a regex parser for keywords_cover(): pattern[i:] up to its closing ")" ->
+    (branches, end), each branch a list of lowercase literal chars, nested branch lists (for
+    required groups) and None (anything that proves nothing: classes, \\s, ".", optional parts).
+    """
+    branches, items = [], []
+    while i < len(pattern) and pattern[i] != ")":
+        c = pattern[i]
+        if c == "|":
+            branches.append(items)
+            items, i = [], i + 1
+        elif c == "(":
+            sub, i = _regex_branches(pattern, i + (3 if pattern.startswith("?:", i + 1) else 1))
+            i += 1  # the ")"
+            optional = i < len(pattern) and pattern[i] in "?*{"
+            items.append(None if optional else sub)
+        elif c == "\\":
+            escaped = pattern[i + 1]
+            items.append(None if escaped.isalnum() else escaped.lower())  # \b, \s, ... vs an escaped literal
+            i += 2
+        elif c == "[":
+            items.append(None)
+            i = pattern.index("]", i + 2) + 1
+        elif c in "?*+{":  # the previous item may be absent or repeated: it no longer proves a literal
+            if items:
+                items[-1] = None
+            i = pattern.index("}", i) + 1 if c == "{" else i + 1
+        else:
+            items.append(None if c in ".^$" else c.lower())
+            i += 1
+    branches.append(items)
+    return branches, i
+
+
+def _branches_covered(branches: list, keywords) -> bool:
+    """Every branch has a literal run, or a required group, that always contains a keyword."""
+    for items in branches:
+        run, covered = "", False
+        for item in items + [None]:
+            if isinstance(item, str):
+                run += item
+                continue
+            covered = any(k in run for k in keywords) or (isinstance(item, list) and _branches_covered(item, keywords))
+            if covered:
+                break
+            run = ""
+        if not covered:
+            return False
+    return True
 
-    return new_id
 
+def keywords_cover(pattern: str, keywords) -> bool:
+    """
+    True if every text `pattern` matches contains one of `keywords` -- i.e. the keyword
+    prefilter can never hide a match. Conservative: False when it cannot tell.
+    """
+    return _branches_covered(_regex_branches(pattern)[0], [k.lower() for k in keywords])
 
-# ---------- RISK / LEASE SCAN ----------
+
+def compile_rules(rules: list) -> list:
+    """
+    [(rule, compiled pattern, prefilter keywords)] -- each pattern is compiled once, up front.
+    A rule whose keywords miss one of its pattern's alternatives is refused, so the hand-written
+    keyword lists cannot drift from the patterns.
+    """
+    for rule in rules:
+        assert not rule.get("keywords") or keywords_cover(rule["pattern"], rule["keywords"]), \
+            f"{rule['name']!r}: some match of its pattern contains none of its keywords"
+    return [(rule, re.compile(rule["pattern"]), tuple(rule.get("keywords", ()))) for rule in rules]
+
+
+def matching_rules(engine: list, txt: str) -> list:
+    """
+    Rules (in rule order) whose pattern matches the already-lowercased txt.
+    A rule only reaches its regex if one of its keywords occurs in txt -- plain substring
+    checks, so clean messages never touch the regex engine.
+    """
+    return [
+        rule for rule, rx, keywords in engine
+        if (not keywords or any(k in txt for k in keywords)) and rx.search(txt)
+    ]
+
+
+_RISK_ENGINE = compile_rules(RISK_RULES)
+
+
+@profiled()
 def risk_detect(message: str):
     txt = (message or "").lower()
-    hits = []
-    total = 0
-    for rule in RISK_RULES:
-        if re.search(rule["pattern"], txt):
-            hits.append(rule)
-            total += rule["score"]
+    hits = matching_rules(_RISK_ENGINE, txt)
+    total = sum(rule["score"] for rule in hits)
     return min(total, 100), hits
 
 
+def risk_detect_batch(messages) -> list:
+    """risk_detect() over a list / iterator of messages; returns [(score, hits), ...] in order."""
+    return [risk_detect(m) for m in messages]
+
+
+def risk_event(text: str, score: int, time: str) -> dict:
+    """Risk timeline entry for a flagged landlord message (the shape the sidebar renders)."""
+    excerpt = (text[:70] + "…") if len(text) > 70 else text
+    return {"time": time, "event": "Scam pattern detected", "score": score, "excerpt": excerpt}
+
+
+@functools.lru_cache(maxsize=RISK_MEMO_SIZE)
+def risk_detect_cached(message: str):
+    """Memoized risk_detect() for UI reruns; treat the returned hits as read-only."""
+    return risk_detect(message)
+
+
+def message_key(msg: dict) -> str:
+    """Stable hash of a chat message (sender + timestamp + text)."""
+    raw = f"{msg.get('sender', '')}\x1f{msg.get('ts', '')}\x1f{msg.get('text', '')}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def record_risk_event(msg: dict, time: str):
+    """
+    Score a chat message and log it to the risk timeline at most once.
+    Reruns on the same message hit the memo and add nothing; returns (score, hits).
+    """
+    score, hits = risk_detect_cached(msg.get("text") or "")
+    if hits:
+        key = message_key(msg)
+        timeline = st.session_state.risk_timeline
+        if all(e.get("key") != key for e in timeline):  # bounded by RISK_TIMELINE_MAX
+            timeline.append(dict(risk_event(msg["text"], score, time), key=key))
+    return score, hits
+
+
+@functools.lru_cache(maxsize=64)
+def _rule_union(patterns: tuple, active: tuple, ignore_case: bool = False) -> re.Pattern:
+    """One compiled alternation over the still-unmatched rules; group `r<i>` is rule i."""
+    return re.compile("|".join(f"(?P<r{i}>{patterns[i]})" for i in active), re.IGNORECASE if ignore_case else 0)
+
+
+def scan_rules(patterns: tuple, text: str, pos: int = 0, limit: int = None, found: dict = None, offset: int = 0) -> dict:
+    """
+    Single sweep over text for all patterns at once, case-insensitive. Fills and returns `found`:
+    {rule index: offset + start of that rule's first match}, offsets into text as given.
+
+    Lowercasing first is cheaper than re.IGNORECASE, but lower() can change the length
+    ("İ" -> "i̇"), which would shift every later offset; such text is matched with IGNORECASE.
+
+    The union regex finds the leftmost spot where any still-unmatched rule matches; that rule
+    is recorded and dropped, and the sweep resumes from the same spot. Matches starting at or
+    after `limit` are left for the caller to rescan (used at chunk seams).
+    """
+    found = {} if found is None else found
+    lowered = text.lower()
+    ignore_case = len(lowered) != len(text)
+    text = text if ignore_case else lowered
+    remaining = tuple(i for i in range(len(patterns)) if i not in found)
+    while remaining:
+        m = _rule_union(patterns, remaining, ignore_case).search(text, pos)
+        if m is None or (limit is not None and m.start() >= limit):
+            break
+        i = int(m.lastgroup[1:])
+        found[i] = offset + m.start()
+        remaining = tuple(j for j in remaining if j != i)
+        pos = m.start()
+    return found
+
+
+LEASE_FLAG_PATTERNS = tuple(rule["pattern"] for rule in LEASE_FLAG_RULES)
+
+
+@profiled()
 def lease_scan(text: str):
-    t = (text or "").lower()
-    flags = []
-    for rule in LEASE_FLAG_RULES:
-        if re.search(rule["pattern"], t):
-            flags.append(rule)
-    return flags
+    found = scan_rules(LEASE_FLAG_PATTERNS, text or "")
+    return [LEASE_FLAG_RULES[i] for i in sorted(found)]
+
+
+def lease_scan_stream(chunks, overlap: int = LEASE_SCAN_OVERLAP) -> list:
+    """
+    Streaming lease_scan() for long leases: `chunks` is any iterable of str (see iter_text_chunks).
+    Returns [{**rule, "offset": n}] in rule order, where n is the character offset of the rule's
+    first match in the whole text. The last `overlap` characters of each chunk are rescanned
+    with the next one, so matches across chunk seams are not lost.
+    """
+    found = {}
+    tail, base, pos = "", 0, 0  # base = absolute offset of tail[0]
+
+    for chunk in chunks:
+        buf = tail + chunk
+        # a match starting in the last `overlap` chars may still grow into the next chunk
+        scan_rules(LEASE_FLAG_PATTERNS, buf, pos, len(buf) - overlap, found, base)
+        if len(found) == len(LEASE_FLAG_PATTERNS):
+            break
+        # keep one extra char in front of the rescanned region so \b sees the real neighbour
+        keep = min(len(buf), overlap + 1)
+        base += len(buf) - keep
+        tail, pos = buf[len(buf) - keep:], max(0, keep - overlap)
+    else:
+        scan_rules(LEASE_FLAG_PATTERNS, tail, pos, None, found, base)
+
+    return [dict(LEASE_FLAG_RULES[i], offset=found[i]) for i in sorted(found)]
+
+
+def iter_text_chunks(f, size: int = LEASE_SCAN_CHUNK):
+    """
+    Yield str chunks from a text or binary file object (e.g. a Streamlit upload). Bytes go
+    through one incremental UTF-8 decoder, so a character split across two reads stays one
+    character and offsets match decoding the whole file.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            rest = decoder.decode(b"", final=True)  # a truncated last character -> U+FFFD
+            if rest:
+                yield rest
+            return
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
 
 
 # ---------- SIDEBAR TIMELINE ----------
@@ -436,7 +1807,7 @@ def render_risk_timeline_sidebar(df: pd.DataFrame):
     if not st.session_state.risk_timeline:
         st.sidebar.caption("No risk events yet.")
         return
-    for e in reversed(st.session_state.risk_timeline[-7:]):
+    for e in itertools.islice(reversed(st.session_state.risk_timeline), 7):
         st.sidebar.markdown(
             f"**{e['event']}**  \nScore: **{e['score']}**  \n_{e['excerpt']}_  \n{e['time']}"
         )
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark: risk_detect() throughput, compiled rule scanner vs the original per-rule loop.
+
+Run from the project folder:
+    python -m benchmarks.bench_risk_detect --messages 50000
+"""
+import argparse
+import random
+import re
+import time
+
+from app.utils import RISK_RULES, risk_detect_batch
+
+BENIGN = [
+    "Hi! Is the unit still available for September?",
+    "Sure, we can book a viewing on Saturday afternoon.",
+    "Utilities are included except internet. Laundry is in the basement.",
+    "The lease is 12 months, and the building is a 10 minute walk to campus.",
+    "Thanks for the details, I will talk to my roommate and get back to you.",
+    "Parking is extra, around 60 dollars a month if you need a spot.",
+]
+RISKY = [
+    "To hold it, send the deposit before viewing. Many people are interested.",
+    "Message me on WhatsApp and we can do a wire transfer today only.",
+    "I can only take cash only, someone else wants it so decide asap.",
+    "Please pay the first month now, before you see the place. Last chance!",
+]
+
+
+def legacy_risk_detect(message: str):
+    """The original implementation: lowercase + one re.search per rule through the re cache."""
+    txt = (message or "").lower()
+    hits = []
+    total = 0
+    for rule in RISK_RULES:
+        if re.search(rule["pattern"], txt):
+            hits.append(rule)
+            total += rule["score"]
+    return min(total, 100), hits
+
+
+def make_corpus(n: int, risky_share: float, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        pool = RISKY if rng.random() < risky_share else BENIGN
+        # 1-3 sentences so message lengths vary like real chat traffic
+        out.append(" ".join(rng.choice(pool) for _ in range(rng.randint(1, 3))))
+    return out
+
+
+def timed(fn, messages):
+    t0 = time.perf_counter()
+    result = fn(messages)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--risky-share", type=float, default=0.1)
+    args = parser.parse_args()
+
+    messages = make_corpus(args.messages, args.risky_share)
+
+    legacy, t_legacy = timed(lambda ms: [legacy_risk_detect(m) for m in ms], messages)
+    compiled, t_compiled = timed(risk_detect_batch, messages)
+    assert legacy == compiled, "compiled detector disagrees with the original implementation"
+
+    print(f"{len(messages)} messages ({args.risky_share:.0%} risky)")
+    print(f"  original loop : {len(messages) / t_legacy:12,.0f} msg/s")
+    print(f"  compiled rules: {len(messages) / t_compiled:12,.0f} msg/s  ({t_legacy / t_compiled:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
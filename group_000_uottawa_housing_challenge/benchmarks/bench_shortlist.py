@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: the Safety page shortlist on 10k / 100k / 1M listing catalogs.
+
+Times one shortlist request (score every visible listing + top-k) for the vectorized engine
+against a per-listing Python loop with a full sort, and checks both pick the same listings.
+
+Run from the project folder:
+    python -m benchmarks.bench_shortlist --k 12
+"""
+import argparse
+from datetime import date, timedelta
+
+import pandas as pd
+
+from app.shortlist import MATCH_MOVE_IN_SPAN, MATCH_UNKNOWN_GAP, MATCH_WEIGHTS, build_match_features, match_scores, rank_listings
+from app.geo import resolve_area
+from app.utils import build_listing_filter_index
+from benchmarks.common import assert_same_top_k, loop_top_k, timed
+from benchmarks.synthetic import make_catalog
+
+LOOP_MAX = 100_000  # the Python loop takes minutes beyond this; larger sizes time the engine only
+PROFILE = {"budget": 900, "areas": ["The Glebe", "ByWard Market / Lowertown", "Annex"], "move_in": date.today() + timedelta(days=45), "roommates": 2, "commute_max": 30}
+
+
+def loop_match_score(profile: dict):
+    """
+    Per-listing score for the baseline, from the row's own fields: resolve_area() and
+    pd.to_datetime() on every row, None for listings the engine scores -inf.
+    """
+    people = profile["roommates"]
+    wanted = {k for a in profile["areas"] for k in resolve_area(a)}
+    move_in = pd.Timestamp(profile["move_in"])
+    total = sum(MATCH_WEIGHTS.values())
+
+    def score(row: dict):
+        share = row["price"] / people
+        if share > profile["budget"] or row["commute_min"] > profile["commute_max"]:
+            return None
+        available = pd.to_datetime(row["available_date"], errors="coerce")
+        timing = MATCH_UNKNOWN_GAP if pd.isna(available) else min(abs((available - move_in).days) / MATCH_MOVE_IN_SPAN, 1.0)
+        gap = (
+            MATCH_WEIGHTS["price"] * min(share / profile["budget"], 1.0)
+            + MATCH_WEIGHTS["area"] * (not wanted.intersection(resolve_area(row["area"])))
+            + MATCH_WEIGHTS["move_in"] * timing
+            + MATCH_WEIGHTS["commute"] * (MATCH_UNKNOWN_GAP if pd.isna(row["commute_min"]) else min(row["commute_min"] / profile["commute_max"], 1.0))
+        )
+        return 100.0 * (1.0 - gap / total)
+    return score
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--k", type=int, default=12)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        index = build_listing_filter_index(make_catalog(n))
+        features, t_features = timed(build_match_features, index)
+        best, t_match = timed(rank_listings, PROFILE, features, args.k)
+
+        line = (f"{n:>9,} listings ({len(index['rows']):,} visible): features {t_features * 1e3:8.2f} ms"
+                f" | match {t_match * 1e3:8.2f} ms")
+        if n <= LOOP_MAX:
+            loop, t_loop = timed(lambda: loop_top_k(index["rows"].to_dict("records"), loop_match_score(PROFILE), args.k))
+            picked = features["rows"].index.get_indexer(best.index)
+            assert_same_top_k(match_scores(PROFILE, features), picked, loop, "shortlist")
+            line += f" | python loop {t_loop * 1e3:9.1f} ms ({t_loop / t_match:,.0f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark suite: the utils data and scoring paths on synthetic catalogs, outside Streamlit.
+
+For every catalog size it times loading (CSV parse + normalize, compiled Arrow catalog),
+visibility masking, the Browse filter index + queries, the spatial index (radius / k-nearest),
+the Safety page shortlist, price bands and seeded listing meta, plus risk_detect / lease_scan
+on synthetic chat and lease corpora. Each case reports the best of --repeat runs; results are
+written as JSON so two versions can be diffed.
+
+Run from the project folder:
+    python -m benchmarks.bench_suite --sizes 1000 100000 1000000 --out bench_results.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.geo import (
+    AREA_GROUPS, build_spatial_index, landmarks, listing_coordinates, spatial_nearest, spatial_within, unmatched_areas,
+)
+from app.utils import (
+    LISTINGS_CSV, build_listing_filter_index, build_price_band_index, compile_catalog, filter_listings,
+    iter_text_chunks, lease_scan, lease_scan_stream, load_listings, normalize_listings, read_compiled_catalog,
+    risk_detect_batch, seeded_listing_meta, visible_mask, _seeded_meta,
+)
+from app.shortlist import build_match_features, rank_listings
+from benchmarks.bench_shortlist import PROFILE
+from benchmarks.synthetic import AREAS, make_catalog, make_chat, make_lease, write_catalog_csv
+
+BROWSE_QUERIES = [  # (max_price, area, beds) -- a spread of slider / select positions
+    (900, None, None), (1200, "Glebe", None), (1500, None, "1"), (2500, "Sandy Hill", "2"),
+    (700, "Vanier", "Studio (0)"), (3000, None, "3+"),
+]
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def catalog_cases(n: int, workdir: str) -> dict:
+    """{case: zero-arg callable} for one catalog size (setup done here is not timed)."""
+    df = make_catalog(n)
+    csv_path = write_catalog_csv(df, os.path.join(workdir, f"listings_{n}.csv"))
+    arrow_path = compile_catalog(csv_path)
+    index = build_listing_filter_index(df)
+    features = build_match_features(index)
+    lat, lon = listing_coordinates(df)
+    grid = build_spatial_index(lat, lon)
+    campus = next(iter(landmarks().values()))
+    ids = df["id"].to_numpy()
+    page = ids[:50]
+
+    return {
+        "load_csv": lambda: normalize_listings(pd.read_csv(csv_path)),
+        "load_compiled": lambda: read_compiled_catalog(arrow_path),
+        "visible_mask": lambda: visible_mask(df),
+        "filter_index_build": lambda: build_listing_filter_index(df),
+        "filter_queries": lambda: [filter_listings(index, p, a, b) for p, a, b in BROWSE_QUERIES],
+        "geocode": lambda: listing_coordinates(df.drop(columns=["lat", "lon"], errors="ignore")),
+        "spatial_index_build": lambda: build_spatial_index(lat, lon),
+        "spatial_within_2km": lambda: spatial_within(grid, *campus, 2.0),
+        "spatial_knn_10": lambda: spatial_nearest(grid, *campus, 10),
+        "shortlist_features": lambda: build_match_features(index),
+        "shortlist_top12": lambda: rank_listings(PROFILE, features, 12),
+        "price_band_index": lambda: build_price_band_index(df),
+        "meta_page_50": lambda: seeded_listing_meta(page),
+        "meta_all": lambda: seeded_listing_meta(ids),
+    }
+
+
+def text_cases(n: int) -> dict:
+    """Scoring workloads scaled with the catalog: n/10 chat messages, a lease of n characters."""
+    chat = make_chat(max(100, n // 10))
+    lease = make_lease(max(10_000, n))
+
+    def stream():
+        return lease_scan_stream(iter_text_chunks(io.StringIO(lease)))
+
+    return {
+        "risk_detect_batch": (lambda: risk_detect_batch(chat), len(chat)),
+        "lease_scan": (lambda: lease_scan(lease), len(lease)),
+        "lease_scan_stream": (stream, len(lease)),
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "timestamp": pd.Timestamp.now().isoformat(timespec="seconds"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="bench_results.json")
+    args = parser.parse_args()
+
+    # Onboarding's area choices must all reach listings (directly or via data/area_aliases.csv)
+    catalog_areas = set(AREAS) | set(load_listings(LISTINGS_CSV)["area"])
+    missing = unmatched_areas([a for group in AREA_GROUPS.values() for a in group], catalog_areas)
+    assert not missing, f"AREA_GROUPS entries matching no catalog area: {missing}"
+
+    # seeded_listing_meta() re-implements MT19937; it must draw exactly what RandomState(id * 17) does
+    top = 0xFFFFFFFF // 17  # largest id whose seed still fits in 32 bits
+    ids = np.r_[np.arange(0, 20_000), np.linspace(20_000, top, 5_000).astype(np.int64), top]
+    got = seeded_listing_meta(ids)
+    expected = pd.DataFrame([_seeded_meta(int(i)) for i in ids], index=ids, columns=got.columns, dtype=object)
+    assert got.equals(expected), "seeded_listing_meta() drifted from RandomState"
+
+    # iter_text_chunks() must not shift offsets when a UTF-8 character straddles two reads
+    text = "é" * 50_001 + " may sublet"  # 2-byte chars, so every odd-sized read splits one
+    want = lease_scan_stream([text])
+    assert want and lease_scan_stream(iter_text_chunks(io.BytesIO(text.encode()), size=4_097)) == want, \
+        "iter_text_chunks() shifted lease-flag offsets at a chunk boundary"
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            for case, fn in catalog_cases(n, workdir).items():
+                seconds = best_of(fn, args.repeat)
+                results.append({"size": n, "case": case, "seconds": round(seconds, 6), "items": n})
+                print(f"{n:>9,}  {case:<20} {seconds * 1e3:10.2f} ms")
+            for case, (fn, items) in text_cases(n).items():
+                seconds = best_of(fn, args.repeat)
+                results.append({"size": n, "case": case, "seconds": round(seconds, 6), "items": items})
+                print(f"{n:>9,}  {case:<20} {seconds * 1e3:10.2f} ms  ({items / seconds:,.0f} items/s)")
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+    print(f"-> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
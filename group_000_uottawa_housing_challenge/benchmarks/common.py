@@ -0,0 +1,33 @@
+"""
+Helpers shared by the top-k matching benchmarks (roommates, listing shortlist): timing one
+call, the per-row Python baseline, and the check that both sides picked equally good rows.
+"""
+import time
+
+import numpy as np
+
+
+def timed(fn, *args):
+    """(fn(*args), seconds)."""
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def loop_top_k(records: list, score, k: int) -> list:
+    """
+    Baseline ranking: call score(record) for every record (None drops it), sort all the
+    scores, keep the first k positions.
+    """
+    scored = []
+    for i, row in enumerate(records):
+        s = score(row)
+        if s is not None:
+            scored.append((s, i))
+    scored.sort(key=lambda t: -t[0])
+    return [i for _, i in scored[:k]]
+
+
+def assert_same_top_k(scores: np.ndarray, best, loop, what: str):
+    """Ties may pick different rows, so compare the chosen scores, not the positions."""
+    assert np.allclose(np.sort(scores[best]), np.sort(scores[loop])), f"vectorized {what} disagrees with the loop"
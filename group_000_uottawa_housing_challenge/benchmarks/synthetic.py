@@ -0,0 +1,112 @@
+"""
+Synthetic data for the benchmarks: listings catalogs in the data/listings.csv / load_listings()
+schema, landlord chat messages and lease texts. Everything is seeded, so a given size always
+produces the same data and results stay comparable between versions.
+"""
+import numpy as np
+import pandas as pd
+
+AREAS = [
+    "Sandy Hill", "ByWard Market", "CentreTown", "Glebe", "Old Ottawa South", "Lowertown", "Vanier",
+    "Old Ottawa East", "Golden Triangle", "Hintonburg", "Little Italy", "Westboro", "Alta Vista",
+    "Overbrook", "Nepean", "Kanata", "Barrhaven",
+]
+STREETS = ["Laurier Ave E", "Wilbrod St", "King Edward Ave", "Elgin St", "Rideau St", "Bank St", "Bronson Ave"]
+
+CHAT_BENIGN = [
+    "Hi! Is the unit still available for September?",
+    "Sure, we can book a viewing on Saturday afternoon.",
+    "Utilities are included except internet. Laundry is in the basement.",
+    "The lease is 12 months, and the building is a 10 minute walk to campus.",
+    "Parking is extra, around 60 dollars a month if you need a spot.",
+]
+CHAT_RISKY = [
+    "To hold it, send the deposit before viewing. Many people are interested.",
+    "Message me on WhatsApp and we can do a wire transfer today only.",
+    "I can only take cash only, someone else wants it so decide asap.",
+]
+LEASE_CLAUSES = [  # ordinary wording that trips none of the lease-flag rules
+    "The tenant shall pay rent on the first day of each month by electronic transfer.",
+    "The premises shall be used only as a private residence for the named occupants.",
+    "The tenant shall keep the premises in a clean and sanitary condition at all times.",
+    "Smoking is prohibited anywhere inside the building, including balconies.",
+    "Quiet hours are from eleven at night until seven in the morning.",
+]
+LEASE_FLAGGED = [  # one clause per lease-flag rule, placed at the end so scans read everything
+    "A security deposit equal to one month of rent is payable at signing.",
+    "The tenant may not sublet the premises without prior written consent.",
+    "Either party may end the tenancy with sixty days written notice.",
+    "The landlord name and service address are listed in schedule A.",
+]
+
+
+def make_catalog(n: int, seed: int = 7, now: pd.Timestamp = None) -> pd.DataFrame:
+    """
+    n listings in the load_listings() schema: up to 5,000 landlords with skewed (Zipf) portfolio
+    sizes, area-dependent prices, verified_at spread over the last ~3 weeks (Verified, Stale
+    and Unverified all present), ~8% pending and ~5% without photos.
+    """
+    rng = np.random.default_rng(seed)
+    now = (now if now is not None else pd.Timestamp.now()).normalize()
+    ids = np.arange(1, n + 1)
+
+    area_idx = rng.integers(0, len(AREAS), n)
+    area_base = np.linspace(1300, 800, len(AREAS))[area_idx]
+    beds = rng.choice([0, 1, 2, 3, 4], n, p=[0.12, 0.45, 0.28, 0.11, 0.04])
+    price = (area_base + 250 * beds + rng.normal(0, 120, n)).clip(450, 3500) // 25 * 25
+
+    n_landlords = max(1, min(5_000, n // 20))
+    landlord = rng.zipf(1.6, n) % n_landlords
+    verified_age = rng.integers(0, 21, n)
+
+    return pd.DataFrame({
+        "id": ids,
+        "title": [f"Listing {i}" for i in ids],
+        "area": np.asarray(AREAS, dtype=object)[area_idx],
+        "price": price.astype(int),
+        "beds": beds.astype(int),
+        "landlord": np.char.add("Landlord ", landlord.astype(str)).astype(object),
+        "verified_at": now - pd.to_timedelta(verified_age, unit="D"),
+        "address": np.char.add(np.char.add(rng.integers(1, 999, n).astype(str), " "),
+                               np.asarray(STREETS)[rng.integers(0, len(STREETS), n)]).astype(object),
+        "available_date": (now + pd.to_timedelta(rng.integers(7, 120, n), unit="D")).strftime("%Y-%m-%d"),
+        "lease_length": np.where(rng.random(n) < 0.7, "12 months", "8 months").astype(object),
+        "photo_count": np.where(rng.random(n) < 0.05, 0, rng.integers(1, 9, n)),
+        "pending": rng.random(n) < 0.08,
+        "lease_draft_uploaded": rng.random(n) < 0.3,
+    })
+
+
+def write_catalog_csv(df: pd.DataFrame, path: str) -> str:
+    """The catalog as a raw CSV (the same columns data/listings.csv has)."""
+    cols = ["id", "title", "area", "price", "beds", "landlord", "verified_at", "address",
+            "available_date", "lease_length", "photo_count"]
+    out = df[cols].copy()
+    out["verified_at"] = out["verified_at"].dt.strftime("%Y-%m-%d")
+    out.to_csv(path, index=False)
+    return path
+
+
+def make_chat(n: int, risky_share: float = 0.1, seed: int = 7) -> list:
+    """n landlord messages of 1-3 sentences, `risky_share` of them with scam wording."""
+    rng = np.random.default_rng(seed)
+    risky = rng.random(n) < risky_share
+    lengths = rng.integers(1, 4, n)
+    picks = rng.integers(0, 1 << 30, (n, 3))
+    out = []
+    for r, k, row in zip(risky, lengths, picks):
+        pool = CHAT_RISKY if r else CHAT_BENIGN
+        out.append(" ".join(pool[p % len(pool)] for p in row[:k]))
+    return out
+
+
+def make_lease(n_chars: int, seed: int = 7) -> str:
+    """
+    A lease-like text of about n_chars characters: ordinary clauses, with one clause per
+    lease-flag rule at the very end (the worst case for a scan that stops once all rules hit).
+    """
+    rng = np.random.default_rng(seed)
+    avg = sum(map(len, LEASE_CLAUSES)) / len(LEASE_CLAUSES) + 1
+    idx = rng.integers(0, len(LEASE_CLAUSES), int(n_chars / avg) + 1)
+    body = " ".join(LEASE_CLAUSES[i] for i in idx)[:n_chars]
+    return body + " " + " ".join(LEASE_FLAGGED)